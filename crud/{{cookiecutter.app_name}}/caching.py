@@ -0,0 +1,252 @@
+from collections import OrderedDict
+from django.core.cache import caches
+from .conf import PetSettings
+import hashlib
+import json
+import pickle
+import threading
+import time
+
+
+class LocalResultCache:
+    """
+    Cache LRU na memória do processo.
+
+    Os valores são guardados serializados (pickle) para que as requisições
+    não compartilhem as mesmas instâncias.
+    """
+
+    def __init__(self, maxsize, timeout):
+        """
+        Construtor
+        """
+
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Pega o valor da chave, se ainda não expirou.
+        """
+
+        with self.lock:
+            item = self.data.get(key)
+
+            if item is None:
+                return None
+
+            expires, value = item
+
+            if expires < time.monotonic():
+                del self.data[key]
+                return None
+
+            self.data.move_to_end(key)
+
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=None):
+        """
+        Guarda o valor removendo os menos usados acima do tamanho máximo.
+        """
+
+        value = pickle.dumps(value)
+        timeout = self.timeout if timeout is None else timeout
+
+        with self.lock:
+            self.data[key] = (time.monotonic() + timeout, value)
+            self.data.move_to_end(key)
+
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove todos os valores.
+        """
+
+        with self.lock:
+            self.data.clear()
+
+
+class SharedResultCache:
+    """
+    Cache compartilhado entre processos usando o cache do Django (PETS_RESULT_CACHE_ALIAS).
+    """
+
+    def __init__(self, alias, timeout):
+        """
+        Construtor
+        """
+
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        """
+        Pega o valor da chave.
+        """
+
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout=None):
+        """
+        Guarda o valor.
+        """
+
+        self.cache.set(key, value, self.timeout if timeout is None else timeout)
+
+    def clear(self):
+        """
+        Os valores antigos expiram sozinhos, pois as chaves mudam de versão.
+        """
+
+
+class PetResultCache:
+    """
+    Cache dos resultados de pets (listagem e detalhe) invalidado por versão.
+
+    Cada pet, dono, ong e o feed de adoção têm um contador de versão que faz parte
+    da chave. As mutações só incrementam o contador (O(1)), e as chaves antigas
+    deixam de ser usadas e expiram sozinhas. As contagens das listagens
+    (QuerysetCounter) também usam essas versões, mesmo sem PETS_RESULT_CACHE.
+    """
+
+    # Marcador de resultado não encontrado (cache negativo).
+    NOT_FOUND = 'pets:not-found'
+
+    local = None
+
+    @classmethod
+    def get_backend(cls):
+        """
+        Pega o backend configurado em PETS_RESULT_CACHE ('local', 'shared' ou None).
+        """
+
+        kind = PetSettings.get('PETS_RESULT_CACHE')
+        timeout = PetSettings.get('PETS_RESULT_CACHE_TIMEOUT')
+
+        if kind == 'local':
+            if cls.local is None:
+                cls.local = LocalResultCache(PetSettings.get('PETS_RESULT_CACHE_SIZE'), timeout)
+
+            return cls.local
+
+        if kind == 'shared':
+            return SharedResultCache(PetSettings.get('PETS_RESULT_CACHE_ALIAS'), timeout)
+
+        return None
+
+    @staticmethod
+    def __get_versions_cache():
+        """
+        Os contadores de versão ficam sempre no cache compartilhado.
+        """
+
+        return caches[PetSettings.get('PETS_RESULT_CACHE_ALIAS')]
+
+    @staticmethod
+    def __get_version_key(scope):
+        """
+        Chave do contador de versão de um escopo.
+        """
+
+        return f"pets:version:{scope}"
+
+    @classmethod
+    def get_scopes(cls, pet):
+        """
+        Escopos de versão afetados por um pet.
+        """
+
+        scopes = [f"pet:{pet.id}"]
+
+        if pet.owner_id:
+            scopes.append(f"owner:{pet.owner_id}")
+
+        if pet.ong_id:
+            scopes.extend([f"ong:{pet.ong_id}", "adoption"])
+
+        return scopes
+
+    @classmethod
+    def get_versions(cls, scopes):
+        """
+        Pega as versões atuais dos escopos.
+
+        Um contador que não existe (ou foi removido do cache) começa com o
+        horário atual em milissegundos, para nunca voltar a uma versão já usada.
+        """
+
+        versions_cache = cls.__get_versions_cache()
+        keys = [cls.__get_version_key(scope) for scope in scopes]
+        versions = versions_cache.get_many(keys)
+
+        for key in keys:
+            if key not in versions:
+                versions_cache.add(key, int(time.time() * 1000), None)
+                versions[key] = versions_cache.get(key)
+
+        return [versions[key] for key in keys]
+
+    @classmethod
+    def get_key(cls, scopes, params):
+        """
+        Chave do resultado a partir dos escopos, suas versões e os parâmetros da consulta.
+        """
+
+        data = json.dumps([scopes, cls.get_versions(scopes), params], sort_keys=True, default=str)
+
+        return f"pets:result:{hashlib.md5(data.encode()).hexdigest()}"
+
+    @classmethod
+    def get(cls, key):
+        """
+        Pega o resultado guardado ou None.
+        """
+
+        backend = cls.get_backend()
+
+        if backend is None or key is None:
+            return None
+
+        return backend.get(key)
+
+    @classmethod
+    def set(cls, key, value, timeout=None):
+        """
+        Guarda o resultado.
+        """
+
+        backend = cls.get_backend()
+
+        if backend is not None and key is not None:
+            backend.set(key, value, timeout)
+
+    @classmethod
+    def invalidate(cls, *pets):
+        """
+        Incrementa as versões dos escopos dos pets alterados.
+        """
+
+        versions_cache = cls.__get_versions_cache()
+        scopes = {scope for pet in pets for scope in cls.get_scopes(pet)}
+
+        for scope in scopes:
+            key = cls.__get_version_key(scope)
+
+            try:
+                versions_cache.incr(key)
+            except ValueError:
+                versions_cache.add(key, int(time.time() * 1000), None)
+
+    @classmethod
+    def clear(cls):
+        """
+        Limpa o cache local do processo.
+        """
+
+        if cls.local is not None:
+            cls.local.clear()
@@ -0,0 +1,41 @@
+from django.conf import settings
+
+
+class PetSettings:
+    """
+    Configurações do app que podem ser sobrescritas no settings do projeto.
+    """
+
+    DEFAULTS = {
+        'PETS_COUNT_THRESHOLD': 1000,
+        'PETS_COUNT_CACHE_TIMEOUT': 300,
+        'PETS_IDENTITY_CACHE_TIMEOUT': 300,
+        'PETS_SEARCH_BACKEND': None,
+        'PETS_ADOPTION_FEED': False,
+        'PETS_RESULT_CACHE': None,
+        'PETS_RESULT_CACHE_ALIAS': 'default',
+        'PETS_RESULT_CACHE_SIZE': 1024,
+        'PETS_RESULT_CACHE_TIMEOUT': 60,
+        'PETS_NOT_FOUND_CACHE_TIMEOUT': 10,
+        'PETS_BULK_MAX_SIZE': 500,
+        'PETS_PURGE_BATCH_SIZE': 500,
+        'PETS_PURGE_RETENTION_DAYS': 30,
+        'PETS_CREATE_SINGLE_STATEMENT': False,
+        'PETS_IDEMPOTENCY_CACHE_ALIAS': 'default',
+        'PETS_IDEMPOTENCY_TIMEOUT': 86400,
+        'PETS_IDEMPOTENCY_LOCK_TIMEOUT': 60,
+        'PETS_PHOTO_PIPELINE': False,
+        'PETS_PHOTO_STAGING_DIR': 'staging',
+        'PETS_PHOTO_WIDTHS': (1280, 640, 320),
+        'PETS_PHOTO_FORMATS': ('jpeg', 'webp'),
+        'PETS_PHOTO_QUALITY': 80,
+        'PETS_PHOTO_WORKERS': 2,
+    }
+
+    @classmethod
+    def get(cls, name):
+        """
+        Pega o valor da configuração no settings ou o seu valor padrão.
+        """
+
+        return getattr(settings, name, cls.DEFAULTS[name])
@@ -0,0 +1,127 @@
+from django.db import migrations
+from django.db.models import Q
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from .conf import PetSettings
+from .models import Pet, PetAdoptionFeed
+from .pagination import KeysetPaginator
+
+
+class AdoptionFeed:
+    """
+    Feed de pets para adoção: pets de ongs, sem dono e que ainda não foram adotados.
+    """
+
+    # Mesmo predicado do índice parcial pets_adoption_idx, para o banco poder usá-lo.
+    condition = Q(owner__isnull=True, ong__isnull=False, is_adopted=False)
+
+    @staticmethod
+    def is_enabled():
+        """
+        Verifica se a tabela pré-calculada do feed está habilitada.
+        """
+
+        return PetSettings.get('PETS_ADOPTION_FEED')
+
+    @classmethod
+    def get_queryset(cls):
+        """
+        Pets do feed de adoção.
+        """
+
+        if cls.is_enabled():
+            return Pet.objects.filter(adoption_feed__isnull=False)
+
+        return Pet.objects.filter(cls.condition)
+
+    @staticmethod
+    def get_ids(after=None, skip=None, limit=None):
+        """
+        Ids dos pets de uma página do feed, lidos somente da tabela do feed.
+
+        A ordenação e o cursor usam as colunas created_at e pet da própria
+        tabela, então a página é uma varredura do índice pets_feed_created_idx.
+        Os cursores dos pets valem aqui, pois o feed guarda o mesmo created_at.
+        """
+
+        paginator = KeysetPaginator(PetAdoptionFeed)
+        queryset = paginator.order(PetAdoptionFeed.objects.all())
+
+        if after:
+            queryset = paginator.after(queryset, after)
+
+        start = skip or 0
+        queryset = queryset[start:start + limit] if limit else queryset[start:]
+
+        return list(queryset.values_list('pet_id', flat=True))
+
+    @staticmethod
+    def is_adoptable(pet):
+        """
+        Verifica se o pet deve estar no feed de adoção.
+        """
+
+        return pet.owner_id is None and pet.ong_id is not None and not pet.is_adopted
+
+    @classmethod
+    def sync(cls, *pets):
+        """
+        Insere ou remove os pets do feed de acordo com o seu estado atual.
+        """
+
+        if not cls.is_enabled():
+            return
+
+        adoptable = [pet for pet in pets if cls.is_adoptable(pet)]
+
+        cls.remove(*[pet.id for pet in pets if not cls.is_adoptable(pet)])
+
+        PetAdoptionFeed.objects.bulk_create(
+            [PetAdoptionFeed(pet_id=pet.id, created_at=pet.created_at) for pet in adoptable],
+            ignore_conflicts=True
+        )
+
+    @classmethod
+    def remove(cls, *identifies):
+        """
+        Remove os pets do feed.
+        """
+
+        if cls.is_enabled() and identifies:
+            PetAdoptionFeed.objects.filter(pet_id__in=identifies).delete()
+
+    @classmethod
+    def rebuild(cls, using='default'):
+        """
+        Recria todo o feed a partir da tabela de pets.
+        """
+
+        PetAdoptionFeed.objects.using(using).all().delete()
+
+        PetAdoptionFeed.objects.using(using).bulk_create(
+            (
+                PetAdoptionFeed(pet_id=identify, created_at=created_at)
+                for identify, created_at in Pet.objects.using(using).filter(cls.condition).values_list('id', 'created_at').iterator()
+            ),
+            batch_size=1000
+        )
+
+
+@receiver(post_migrate, dispatch_uid='fill_pets_adoption_feed')
+def fill_adoption_feed(sender, using='default', plan=None, **kwargs):
+    """
+    Preenche o feed com os pets que já estão em adoção quando o migrate cria a tabela do feed.
+
+    A tabela sai do makemigrations do app como qualquer modelo, mas os pets
+    que já existiam precisam entrar no feed.
+    """
+
+    created = any(
+        isinstance(operation, migrations.CreateModel) and operation.name_lower == PetAdoptionFeed._meta.model_name
+        for migration, backwards in plan or []
+        if not backwards and migration.app_label == sender.label == PetAdoptionFeed._meta.app_label
+        for operation in migration.operations
+    )
+
+    if created:
+        AdoptionFeed.rebuild(using)
@@ -0,0 +1,165 @@
+from enum import Enum
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, migrations, models
+from django.db.models.signals import post_migrate, pre_migrate
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+
+# Colunas que deixaram de ser EnumField e voltam para o texto no fim do migrate, por banco e app.
+pending_decodes = {}
+
+
+class EnumField(models.SmallIntegerField):
+    """
+    Campo de um enum do enum.py guardado como inteiro pequeno no banco.
+
+    Na aplicação (e no GraphQL) o valor continua sendo a string do enum. O
+    código no banco é a posição do item no enum, começando em 1, então novos
+    itens devem ser sempre adicionados no final do enum.
+    """
+
+    def __init__(self, enum, *args, **kwargs):
+        """
+        Construtor
+        """
+
+        self.enum = enum
+        self.codes = {tag.value: code for code, tag in enumerate(enum, start=1)}
+        self.values = {code: value for value, code in self.codes.items()}
+
+        kwargs['choices'] = [(tag.value, tag.value) for tag in enum]
+
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        """
+        As choices vêm do enum, então não vão para as migrações.
+        """
+
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('choices', None)
+
+        return name, path, [self.enum, *args], kwargs
+
+    @cached_property
+    def validators(self):
+        """
+        Sem os validadores de faixa do inteiro, pois o valor na aplicação é a string.
+        """
+
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        """
+        Código do banco para a string do enum.
+        """
+
+        if value is None:
+            return value
+
+        return self.values.get(value, value)
+
+    def to_python(self, value):
+        """
+        Aceita a string, o item do enum ou o código, e retorna a string do enum.
+        """
+
+        if isinstance(value, Enum):
+            return value.value
+
+        if isinstance(value, int) and value in self.values:
+            return self.values[value]
+
+        return value
+
+    def get_prep_value(self, value):
+        """
+        String do enum para o código do banco.
+        """
+
+        value = self.to_python(value)
+
+        return super().get_prep_value(self.codes.get(value, value))
+
+
+def is_text_column(connection, table, column):
+    """
+    Verifica se a coluna da tabela está guardada como texto no banco.
+    """
+
+    introspection = connection.introspection
+
+    with connection.cursor() as cursor:
+        if table not in introspection.table_names(cursor):
+            return False
+
+        description = introspection.get_table_description(cursor, table)
+
+    return any(
+        info.name == column and introspection.get_field_type(info.type_code, info) in ('CharField', 'TextField')
+        for info in description
+    )
+
+
+def replace_values(connection, table, column, values):
+    """
+    Troca os valores da coluna de acordo com o dicionário (valor atual: valor novo).
+    """
+
+    table, column = connection.ops.quote_name(table), connection.ops.quote_name(column)
+
+    with connection.cursor() as cursor:
+        for old, new in values.items():
+            cursor.execute(f"UPDATE {table} SET {column} = %s WHERE {column} = %s", [new, old])
+
+
+@receiver(pre_migrate, dispatch_uid='encode_enum_fields')
+def encode_enum_fields(sender, using='default', plan=None, apps=None, **kwargs):
+    """
+    Converte os dados dos campos que o migrate troca para EnumField ou de volta para texto.
+
+    O AlterField gerado pelo makemigrations só muda o tipo da coluna. Antes
+    dele a string do enum vira o código (ainda como texto), para a coluna
+    poder virar inteiro. A volta para a string fica para o fim do migrate,
+    depois da coluna voltar a ser texto. Somente migrações aplicadas para
+    frente são convertidas.
+    """
+
+    connection = connections[using]
+
+    for migration, backwards in plan or []:
+        if backwards or migration.app_label != sender.label:
+            continue
+
+        for operation in migration.operations:
+            if not isinstance(operation, migrations.AlterField):
+                continue
+
+            try:
+                old = apps.get_model(migration.app_label, operation.model_name)._meta.get_field(operation.name)
+            except (LookupError, FieldDoesNotExist):
+                continue
+
+            new = operation.field
+            table = old.model._meta.db_table
+
+            if isinstance(new, EnumField) and not isinstance(old, EnumField):
+                if is_text_column(connection, table, old.column):
+                    replace_values(connection, table, old.column, {value: str(code) for value, code in new.codes.items()})
+            elif isinstance(old, EnumField) and not isinstance(new, EnumField):
+                pending_decodes.setdefault((using, sender.label), []).append(
+                    (table, old.column, {str(code): value for code, value in old.values.items()})
+                )
+
+
+@receiver(post_migrate, dispatch_uid='decode_enum_fields')
+def decode_enum_fields(sender, using='default', **kwargs):
+    """
+    Volta o código para a string do enum nas colunas que deixaram de ser EnumField.
+    """
+
+    connection = connections[using]
+
+    for table, column, values in pending_decodes.pop((using, sender.label), []):
+        if is_text_column(connection, table, column):
+            replace_values(connection, table, column, values)
@@ -0,0 +1,107 @@
+from django.core.cache import caches
+from django.core.files import File
+from common.exceptions import CustomError
+from .conf import PetSettings
+import hashlib
+import json
+
+
+class IdempotencyStore:
+    """
+    Guarda o resultado das mutações de criação pela chave de idempotência do cliente.
+
+    Uma requisição repetida com a mesma chave (ex.: retentativa do app após
+    perder a resposta) recebe o resultado original em vez de criar de novo.
+    Reusar a chave com outros dados é um erro. Sem chave todos os métodos não
+    fazem nada.
+
+    A reserva da chave dura PETS_IDEMPOTENCY_LOCK_TIMEOUT, que deve ser maior
+    que o pior tempo da mutação: se expirar no meio, uma retentativa executa
+    a mutação de novo.
+    """
+
+    # Marcador da chave cuja primeira requisição ainda está em andamento.
+    PENDING = 'pets:idempotency:pending'
+
+    def __init__(self, user, operation, key, payload=None):
+        """
+        Construtor
+
+        A chave é separada por usuário e mutação, para um cliente não ler o resultado de outro.
+        O payload são os dados da requisição, guardados como impressão digital junto do resultado.
+        """
+
+        self.cache = caches[PetSettings.get('PETS_IDEMPOTENCY_CACHE_ALIAS')]
+        self.idempotency_key = key
+        self.key = None
+        self.fingerprint = None
+
+        if key:
+            digest = hashlib.md5(str(key).encode()).hexdigest()
+            self.key = f"pets:idempotency:{operation}:{user.pk}:{digest}"
+            self.fingerprint = self.get_fingerprint(payload)
+
+    @staticmethod
+    def get_fingerprint(payload):
+        """
+        Hash dos dados da requisição. Arquivos entram pelo nome e tamanho.
+        """
+
+        def encode(value):
+            if isinstance(value, File):
+                return [value.name, value.size]
+
+            return str(value)
+
+        return hashlib.md5(json.dumps(payload, sort_keys=True, default=encode).encode()).hexdigest()
+
+    def begin(self):
+        """
+        Reserva a chave e retorna o resultado guardado, se a requisição já foi feita.
+
+        Retorna None quando a mutação deve ser executada. A chave reusada com
+        outros dados gera um CustomError.
+        """
+
+        if self.key is None:
+            return None
+
+        if self.cache.add(self.key, self.PENDING, PetSettings.get('PETS_IDEMPOTENCY_LOCK_TIMEOUT')):
+            return None
+
+        value = self.cache.get(self.key)
+
+        if value is None:
+            return self.begin()
+
+        if value == self.PENDING:
+            raise CustomError(
+                message="Uma requisição com essa chave de idempotência ainda está em andamento.",
+                cause=f"Chave: {self.idempotency_key}"
+            )
+
+        fingerprint, result = value
+
+        if fingerprint != self.fingerprint:
+            raise CustomError(
+                message="A chave de idempotência já foi usada com outros dados.",
+                cause=f"Chave: {self.idempotency_key}"
+            )
+
+        return result
+
+    def finish(self, value):
+        """
+        Guarda o resultado da mutação pelo tempo de PETS_IDEMPOTENCY_TIMEOUT.
+        """
+
+        if self.key is not None:
+            self.cache.set(self.key, (self.fingerprint, value), PetSettings.get('PETS_IDEMPOTENCY_TIMEOUT'))
+
+    def cancel(self):
+        """
+        Libera a chave quando a mutação falha, para o cliente poder tentar de novo.
+        """
+
+        if self.key is not None:
+            self.cache.delete(self.key)
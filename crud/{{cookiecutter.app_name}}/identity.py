@@ -0,0 +1,100 @@
+class IdentityMap:
+    """
+    Mapa de identidade da requisição: guarda os objetos já carregados por chave.
+
+    As chaves de modelos são (modelo, pk) e as de outras consultas são tuplas
+    com um nome, como ('account', identify).
+    """
+
+    def __init__(self):
+        """
+        Construtor
+        """
+
+        self.objects = {}
+
+    @classmethod
+    def from_info(cls, info):
+        """
+        Pega o mapa da requisição atual, criando-o caso não exista.
+        """
+
+        if info is None:
+            return cls()
+
+        identity_map = getattr(info.context, 'pet_identity_map', None)
+
+        if identity_map is None:
+            identity_map = cls()
+
+            if info.context is not None:
+                setattr(info.context, 'pet_identity_map', identity_map)
+
+        return identity_map
+
+    @staticmethod
+    def get_key(model, identify):
+        """
+        Chave de um objeto de modelo no mapa.
+        """
+
+        return (model._meta.concrete_model, str(identify))
+
+    def get(self, model, identify):
+        """
+        Pega o objeto já carregado da modelo pelo seu pk.
+        """
+
+        return self.objects.get(self.get_key(model, identify))
+
+    @staticmethod
+    def __fill(stored, obj):
+        """
+        Completa a instância do mapa com as colunas e relações que só o novo objeto carregou.
+
+        A listagem guarda objetos parciais (only/values_list); sem isso uma busca
+        completa do mesmo pet receberia a instância parcial e cada campo adiado
+        faria uma consulta.
+        """
+
+        missing = stored.get_deferred_fields() - obj.get_deferred_fields()
+
+        for attname in missing:
+            stored.__dict__[attname] = obj.__dict__[attname]
+
+        loaded = getattr(stored, '_loaded_values', None)
+
+        if loaded is not None:
+            loaded.update({attname: obj.__dict__[attname] for attname in missing})
+
+        for name, value in obj._state.fields_cache.items():
+            stored._state.fields_cache.setdefault(name, value)
+
+    def add(self, obj):
+        """
+        Adiciona o objeto no mapa e retorna a instância que deve ser usada.
+        """
+
+        stored = self.objects.setdefault(self.get_key(type(obj), obj.pk), obj)
+
+        if stored is not obj:
+            self.__fill(stored, obj)
+
+        return stored
+
+    def merge(self, objs):
+        """
+        Adiciona vários objetos, trocando os já carregados pela instância do mapa.
+        """
+
+        return [self.add(obj) for obj in objs]
+
+    def get_or_load(self, key, loader):
+        """
+        Pega o resultado de uma consulta pela chave ou executa o loader uma única vez.
+        """
+
+        if key not in self.objects:
+            self.objects[key] = loader()
+
+        return self.objects[key]
@@ -0,0 +1,82 @@
+from promise import Promise
+from promise.dataloader import DataLoader
+from .models import Pet
+
+
+class ModelLoader(DataLoader):
+    """
+    Carrega objetos de uma modelo em lote pelos seus identificadores.
+    """
+
+    def __init__(self, model):
+        """
+        Construtor
+        """
+
+        super().__init__()
+        self.model = model
+
+    def batch_load_fn(self, keys):
+        """
+        Busca todos os objetos das chaves acumuladas com um único IN (...).
+        """
+
+        objs = self.model.objects.in_bulk(keys)
+
+        return Promise.resolve([objs.get(key) for key in keys])
+
+
+class PetLoaders:
+    """
+    Loaders das relações da modelo Pet que vivem durante uma requisição.
+    """
+
+    relations = (
+        {%- for field in cookiecutter.model.fields if field.type in ["ForeignKey", "OneToOneField"] %}
+        '{{field.name}}',
+        {%- endfor %}
+    )
+
+    def __init__(self):
+        """
+        Construtor
+        """
+
+        self.loaders = {
+            name: ModelLoader(Pet._meta.get_field(name).related_model)
+            for name in self.relations
+        }
+
+    @classmethod
+    def from_info(cls, info):
+        """
+        Pega os loaders da requisição atual, criando-os caso não existam.
+        """
+
+        loaders = getattr(info.context, 'pet_loaders', None)
+
+        if loaders is None:
+            loaders = cls()
+
+            if info.context is not None:
+                setattr(info.context, 'pet_loaders', loaders)
+
+        return loaders
+
+    @classmethod
+    def load(cls, info, parent, name):
+        """
+        Carrega a relação do pet, usando o cache da instância quando existir.
+        """
+
+        field = Pet._meta.get_field(name)
+
+        if field.is_cached(parent):
+            return getattr(parent, name)
+
+        identify = getattr(parent, field.attname)
+
+        if identify is None:
+            return None
+
+        return cls.from_info(info).loaders[name].load(identify)
@@ -0,0 +1,154 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .conf import PetSettings
+from .models import Pet
+import hashlib
+
+User = get_user_model()
+
+
+class IdentityLookup:
+    """
+    Resolve o identificador do usuário (email ou username) para os ids de dono e ong.
+    """
+
+    relations = ('owner', 'ong')
+
+    @staticmethod
+    def __get_key(identify):
+        """
+        Chave do cache de um identificador.
+        """
+
+        return f"pets:identify:{hashlib.md5(str(identify).encode()).hexdigest()}"
+
+    @staticmethod
+    def __get_id(relation, identify):
+        """
+        Pega o id do perfil (dono ou ong) da conta com o email ou username passado.
+        """
+
+        model = Pet._meta.get_field(relation).related_model
+
+        return model.objects.filter(
+            Q(account__email=identify) |
+            Q(account__username=identify)
+        ).values_list('id', flat=True).first()
+
+    @classmethod
+    def resolve(cls, identify):
+        """
+        Retorna um dicionário com o id de cada relação, usando o cache quando possível.
+        """
+
+        key = cls.__get_key(identify)
+        ids = cache.get(key)
+
+        if ids is None:
+            ids = {relation: cls.__get_id(relation, identify) for relation in cls.relations}
+
+            # Identificadores não encontrados não vão para o cache, pois a conta
+            # pode ser criada logo em seguida.
+            if any(ids.values()):
+                cache.set(key, ids, PetSettings.get('PETS_IDENTITY_CACHE_TIMEOUT'))
+
+        return ids
+
+    @classmethod
+    def invalidate(cls, *identifies):
+        """
+        Remove do cache os identificadores (emails e usernames) passados.
+
+        Também remove depois do commit, para uma leitura concorrente não guardar
+        de novo o valor antigo antes da transação terminar.
+        """
+
+        keys = [cls.__get_key(identify) for identify in identifies if identify]
+
+        if keys:
+            cache.delete_many(keys)
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def invalidate_account(cls, account_id):
+        """
+        Remove do cache os identificadores atuais de uma conta.
+        """
+
+        identifies = User.objects.filter(pk=account_id).values_list('email', 'username').first()
+
+        if identifies:
+            cls.invalidate(*identifies)
+
+    @staticmethod
+    def get_filter(ids):
+        """
+        Filtro dos pets do usuário pelos ids de dono ou ong retornados pelo resolve.
+        """
+
+        condition = Q()
+
+        for relation, identifier in ids.items():
+            if identifier:
+                condition |= Q(**{f"{relation}_id": identifier})
+
+        return condition
+
+
+@receiver(pre_save, sender=User, dispatch_uid='remember_pets_identify')
+def remember_pets_identify(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Guarda o email e o username antigos da conta para invalidá-los depois do save.
+    """
+
+    instance._pets_identifies = ()
+
+    if raw or instance.pk is None:
+        return
+
+    if update_fields is not None and not {'email', 'username'} & set(update_fields):
+        return
+
+    instance._pets_identifies = User.objects.filter(pk=instance.pk).values_list('email', 'username').first() or ()
+
+
+@receiver(post_save, sender=User, dispatch_uid='invalidate_pets_identify_save')
+def invalidate_pets_identify_save(sender, instance, created=False, **kwargs):
+    """
+    Remove do cache os identificadores antigos e novos da conta alterada.
+
+    Um email antigo pode ser usado por outra conta logo em seguida.
+    """
+
+    previous = getattr(instance, '_pets_identifies', ())
+
+    if previous and tuple(previous) != (instance.email, instance.username):
+        IdentityLookup.invalidate(*previous, instance.email, instance.username)
+
+
+@receiver(post_delete, sender=User, dispatch_uid='invalidate_pets_identify')
+def invalidate_pets_identify(sender, instance, **kwargs):
+    """
+    Remove do cache os identificadores da conta deletada.
+    """
+
+    IdentityLookup.invalidate(instance.email, instance.username)
+
+
+def invalidate_pets_identify_profile(sender, instance, **kwargs):
+    """
+    Remove do cache os identificadores da conta cujo perfil (dono ou ong) foi criado, alterado ou removido.
+    """
+
+    IdentityLookup.invalidate_account(instance.account_id)
+
+
+for relation in IdentityLookup.relations:
+    profile = Pet._meta.get_field(relation).related_model
+
+    post_save.connect(invalidate_pets_identify_profile, sender=profile, dispatch_uid=f'invalidate_pets_identify_{relation}_save')
+    post_delete.connect(invalidate_pets_identify_profile, sender=profile, dispatch_uid=f'invalidate_pets_identify_{relation}_delete')
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from petguard.pets.photos import PhotoPipeline
+
+
+class Command(BaseCommand):
+    """
+    Processa as fotos de pets que ainda estão em staging.
+
+    Usado como worker quando PETS_PHOTO_WORKERS é 0 ou para retomar fotos
+    que ficaram pendentes após uma falha.
+    """
+
+    help = "Gera as versões das fotos em staging e troca a foto dos pets."
+
+    def add_arguments(self, parser):
+        """
+        Argumentos do comando.
+        """
+
+        parser.add_argument('--limit', type=int, default=None, help="Quantidade máxima de fotos processadas.")
+
+    def handle(self, *args, **options):
+        """
+        Executa o comando.
+        """
+
+        if not PhotoPipeline.is_enabled():
+            self.stdout.write("O processamento assíncrono de fotos (PETS_PHOTO_PIPELINE) está desabilitado.")
+            return
+
+        total = PhotoPipeline.process_pending(options['limit'])
+
+        self.stdout.write(self.style.SUCCESS(f"{total} fotos processadas."))
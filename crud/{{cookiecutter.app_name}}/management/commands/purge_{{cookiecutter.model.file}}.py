@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from petguard.pets.purge import PetPurge
+
+
+class Command(BaseCommand):
+    """
+    Apaga definitivamente os pets removidos (soft delete), suas relações e fotos.
+
+    Deve ser agendado (cron) para rodar fora do horário de pico.
+    """
+
+    help = "Apaga definitivamente, em lotes, os pets removidos há mais dias que a retenção."
+
+    def add_arguments(self, parser):
+        """
+        Argumentos do comando.
+        """
+
+        parser.add_argument('--batch-size', type=int, default=None, help="Quantidade de pets por lote.")
+        parser.add_argument('--retention-days', type=int, default=None, help="Dias que um pet removido é mantido.")
+
+    def handle(self, *args, **options):
+        """
+        Executa o comando.
+        """
+
+        if not PetPurge.is_soft_delete():
+            self.stdout.write("A modelo não foi gerada com a opção soft_delete.")
+            return
+
+        total = PetPurge.purge(options['batch_size'], options['retention_days'])
+
+        self.stdout.write(self.style.SUCCESS(f"{total} pets apagados."))
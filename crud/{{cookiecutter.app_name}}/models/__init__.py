@@ -1,2 +1,6 @@
 # flake8: noqa
 from .{{cookiecutter.model['file']}} import {{cookiecutter.model['name']}}
+from .adoption_feed import PetAdoptionFeed
+
+# Receivers do migrate que completam as migrações geradas pelo makemigrations.
+from .. import feed, fields, search
@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class PetAdoptionFeed(models.Model):
+    """
+    Feed pré-calculado dos pets em adoção (habilitado por PETS_ADOPTION_FEED).
+    """
+
+    pet = models.OneToOneField(
+        '{{cookiecutter.model.name}}',
+        help_text="Pet em adoção.",
+        on_delete=models.CASCADE,
+        related_name='adoption_feed',
+        primary_key=True
+    )
+
+    created_at = models.DateTimeField(
+        "Criado em",
+        help_text="Data de criação do pet, usada na ordenação do feed."
+    )
+
+    def __str__(self):
+        """
+        Retorno o objeto em formato de string.
+        """
+
+        return str(self.pet_id)
+
+    class Meta:
+        """
+        Algumas informações adicionais.
+        """
+
+        db_table = "{{cookiecutter.model.db_name}}_adoption_feed"
+        ordering = ('created_at', 'pet')
+        indexes = [
+            models.Index(
+                name="pets_feed_created_idx",
+                fields=['created_at', 'pet']
+            )
+        ]
@@ -1,6 +1,10 @@
 from django.db import models
 from common.exceptions import CustomError
 from common.models import BaseModel
+from ..tracking import DirtyFieldsMixin
+{% if cookiecutter.model.enum_storage is defined and cookiecutter.model.enum_storage == "integer" -%}
+from ..fields import EnumField
+{% endif -%}
 {% for obj in cookiecutter.model.imports -%}
 from {{obj.path}} import {% for class_obj in obj.value %}{{class_obj}}{{", " if not loop.last }}{% endfor %}
 {% endfor %}
@@ -9,6 +13,15 @@ class {{cookiecutter.model.name}}Manager(models.Manager):
     """
     Gerenciado de querysets.
     """
+    {%- if cookiecutter.model.soft_delete is defined and cookiecutter.model.soft_delete %}
+
+    def get_queryset(self):
+        """
+        Esconde os objetos removidos (soft delete).
+        """
+
+        return super().get_queryset().filter(deleted_at__isnull=True)
+    {%- endif %}
 
     def get_{{cookiecutter.model.file|lower}}(self, identify):
         """
@@ -24,30 +37,63 @@ class {{cookiecutter.model.name}}Manager(models.Manager):
             )
 
         return obj
+    {%- if cookiecutter.model.account_fields is defined %}
+
+    def get_{{cookiecutter.model.file|lower}}_by_account(self, identify, account):
+        """
+        Pega o objeto pelo id e pelo email ou username da conta dona em uma única consulta.
+
+        Retorna None quando não encontra, para quem chamou buscar o motivo e
+        lançar o erro correto (conta inexistente ou objeto de outra conta).
+        """
 
+        if not str(identify).isdigit():
+            return None
 
-class {{cookiecutter.model.name}}(BaseModel):
+        condition = models.Q()
+
+        for field in [{% for name in cookiecutter.model.account_fields %}'{{name}}'{{", " if not loop.last }}{% endfor %}]:
+            condition |= models.Q(**{f"{field}__account__email": account})
+            condition |= models.Q(**{f"{field}__account__username": account})
+
+        return self.model.objects.filter(condition, id=identify).first()
+    {%- endif %}
+
+
+class {{cookiecutter.model.name}}(DirtyFieldsMixin, BaseModel):
     """
     {{cookiecutter.model.description}}
     """
 
     {% for field in cookiecutter.model.fields -%}
-    {{field.name}} = models.{{field.type}}(
-        {% if field.type in ["ForeignKey", "OneToOneField", "ManyToManyField"] -%}
+    {%- set integer_enum = field.enum is defined and cookiecutter.model.enum_storage is defined and cookiecutter.model.enum_storage == "integer" -%}
+    {{field.name}} = {{"EnumField" if integer_enum else "models." ~ field.type}}(
+        {% if integer_enum -%}
+        {{field.enum}},
+        "{{field.title}}",
+        {%- elif field.type in ["ForeignKey", "OneToOneField", "ManyToManyField"] -%}
         {{field.relationship}},
         {%- elif field.type == "ImageField" -%}
         upload_to="{{field.upload_to}}",
         {%- else -%}
         "{{field.title}}",
         {%- endif %}
-        help_text="{{field.description}}",
-        {%- for key, value in field.attr.items() %}
+        help_text="{{field.description}}"{{"," if not integer_enum or field.attr.keys()|reject("in", ["max_length", "choices"])|list }}
+        {%- for key, value in field.attr.items() if not (integer_enum and key in ["max_length", "choices"]) %}
         {{key}}={{value}}{{"," if not loop.last }}
         {%- endfor %}
     )
 
     {% endfor -%}
+    {% if cookiecutter.model.soft_delete is defined and cookiecutter.model.soft_delete %}deleted_at = models.DateTimeField(
+        "Removido em",
+        help_text="Data da remoção (soft delete). O objeto é apagado depois pelo purge_{{cookiecutter.model.file|lower}}.",
+        null=True,
+        blank=True,
+        editable=False
+    )
 
+    {% endif -%}
     objects = {{cookiecutter.model.name}}Manager()
 
     def __str__(self):
@@ -64,3 +110,19 @@ class {{cookiecutter.model.name}}(BaseModel):
 
         db_table = "{{cookiecutter.model.db_name}}"
         ordering = {{cookiecutter.model.ordering}}
+        {%- if cookiecutter.model.indexes is defined %}
+        indexes = [
+            {%- for index in cookiecutter.model.indexes %}
+            models.Index(
+                name="{{index.name}}",
+                fields=[{% for name in index.fields %}'{{name}}'{{", " if not loop.last }}{% endfor %}]
+                {%- if index.condition is defined %},
+                condition={{index.condition}}
+                {%- endif %}
+                {%- if index.include is defined %},
+                include=[{% for name in index.include %}'{{name}}'{{", " if not loop.last }}{% endfor %}]
+                {%- endif %}
+            ){{"," if not loop.last }}
+            {%- endfor %}
+        ]
+        {%- endif %}
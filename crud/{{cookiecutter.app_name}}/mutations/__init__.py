@@ -1,4 +1,7 @@
 # flake8: noqa
 from .create_pets import CreatePetMutation
+from .bulk_create_pets import CreatePetsMutation
 from .update_pets import UpdatePetMutation
+from .bulk_update_pets import UpdatePetsMutation
 from .delete_pets import DeletePetMutation
+from .bulk_delete_pets import DeletePetsMutation
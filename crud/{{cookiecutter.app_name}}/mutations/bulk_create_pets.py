@@ -0,0 +1,78 @@
+from common.utils import GenericUtils
+from common.permissions import GenericPermissions
+from petguard.pets.mutations.create_pets import CreatePetInput
+from petguard.pets.models import Pet
+from petguard.pets.resolvers import BulkCreatePetsResolver
+from petguard.pets.idempotency import IdempotencyStore
+from petguard.pets.types import PetType, PetErrorType
+from graphene.types import Boolean, List, NonNull, String
+import graphene
+
+
+class CreatePetsMutation(graphene.Mutation):
+    """
+    Criar vários pets de uma vez.
+    """
+
+    pets = List(
+        PetType,
+        description="Pets criados."
+    )
+
+    errors = List(
+        PetErrorType,
+        description="Erros dos itens que não foram criados (somente com partial)."
+    )
+
+    class Arguments:
+        """
+        Define os dados que você pode enviar para o servidor.
+        """
+
+        data = List(
+            NonNull(CreatePetInput),
+            description="Lista com o corpo de cada pet.",
+            required=True
+        )
+
+        partial = Boolean(
+            description="Cria os itens válidos e retorna os erros dos inválidos em vez de cancelar tudo.",
+            required=False,
+            default_value=False
+        )
+
+        idempotency_key = String(
+            description="Chave única da requisição. Repetir a chave retorna os pets já criados em vez de criar outros.",
+            required=False
+        )
+
+    def mutate(self, info, data, partial=False, idempotency_key=None):
+        """
+        Mutações
+        """
+
+        logged_user = GenericUtils.get_logged_user(info)
+
+        GenericPermissions.auth_validation(logged_user)
+
+        store = IdempotencyStore(logged_user, 'create_pets', idempotency_key, {'data': data, 'partial': partial})
+        saved = store.begin()
+
+        if saved is not None:
+            pets = Pet.objects.in_bulk(saved['pets'])
+
+            return CreatePetsMutation(
+                pets=[pets[identify] for identify in saved['pets'] if identify in pets],
+                errors=saved['errors']
+            )
+
+        try:
+            resolver = BulkCreatePetsResolver(logged_user, data, partial)
+            pets = resolver.get_result()
+        except Exception:
+            store.cancel()
+            raise
+
+        store.finish({'pets': [pet.id for pet in pets], 'errors': resolver.errors})
+
+        return CreatePetsMutation(pets=pets, errors=resolver.errors)
@@ -0,0 +1,43 @@
+from common.utils import GenericUtils
+from common.permissions import GenericPermissions
+from petguard.pets.resolvers import BulkDeletePetsResolver
+from graphene.types import Int, List, NonNull
+import graphene
+
+
+class DeletePetsMutation(graphene.Mutation):
+    """
+    Deleta vários pets de uma vez.
+    """
+
+    removed = Int(description="Quantidade de pets removidos.")
+
+    not_found = List(
+        Int,
+        description="Identificadores dos pets não encontrados ou que não pertencem ao usuário."
+    )
+
+    class Arguments:
+        """
+        Define os dados que você pode enviar para o servidor.
+        """
+
+        identifies = List(
+            NonNull(Int),
+            description="Identificadores dos pets.",
+            required=True
+        )
+
+    def mutate(self, info, identifies):
+        """
+        Mutações
+        """
+
+        logged_user = GenericUtils.get_logged_user(info)
+
+        GenericPermissions.auth_validation(logged_user)
+
+        resolver = BulkDeletePetsResolver(logged_user, identifies)
+        removed = resolver.get_result()
+
+        return DeletePetsMutation(removed=removed, not_found=resolver.not_found)
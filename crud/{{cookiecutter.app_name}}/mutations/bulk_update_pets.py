@@ -0,0 +1,51 @@
+from common.utils import GenericUtils
+from common.permissions import GenericPermissions
+from petguard.pets.mutations.update_pets import UpdatePetInput
+from petguard.pets.resolvers import BulkUpdatePetsResolver
+from petguard.pets.types import PetType
+from graphene.types import Int, List, NonNull
+import graphene
+
+
+class UpdatePetsInput(graphene.InputObjectType):
+    """
+    Classe responsável pelos campos de atualização de um pet na atualização em lote.
+    """
+
+    identify = Int(required=True, description="Identificador do pet.")
+    data = UpdatePetInput(required=True, description="Corpo da atualização do pet.")
+
+
+class UpdatePetsMutation(graphene.Mutation):
+    """
+    Atualiza vários pets de uma vez.
+    """
+
+    pets = List(
+        PetType,
+        description="Pets atualizados."
+    )
+
+    class Arguments:
+        """
+        Define os dados que você pode enviar para o servidor.
+        """
+
+        data = List(
+            NonNull(UpdatePetsInput),
+            description="Lista com o identificador e o corpo de cada pet.",
+            required=True
+        )
+
+    def mutate(self, info, data):
+        """
+        Mutações
+        """
+
+        logged_user = GenericUtils.get_logged_user(info)
+
+        GenericPermissions.auth_validation(logged_user)
+
+        pets = BulkUpdatePetsResolver(logged_user, data).get_result()
+
+        return UpdatePetsMutation(pets=pets)
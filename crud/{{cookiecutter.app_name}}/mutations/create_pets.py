@@ -1,7 +1,10 @@
 from common.scalars import DateField, PhoneField, PositiveIntegerField, PositiveFloatField
 from common.utils import GenericUtils
 from common.permissions import GenericPermissions
+from petguard.pets.scalars import PetTypeField, PetSexField, PetSizeField, PetTemperamentField
+from petguard.pets.models import Pet
 from petguard.pets.resolvers import CreatePetsResolver
+from petguard.pets.idempotency import IdempotencyStore
 from petguard.pets.types import PetType
 from graphene.types import String, Boolean, Field
 from graphene_file_upload.scalars import Upload
@@ -13,7 +16,7 @@ class CreateAlimentationInput(graphene.InputObjectType):
     Classe responsável pelos campos de criação da alimentação do pet.
     """
 
-    qtd = String(required=True, description="Quantidade de ração diaria (SMALL, MEDIUM, BIG).")
+    qtd = PetSizeField(required=True, description="Quantidade de ração diaria (SMALL, MEDIUM, BIG).")
     food = String(required=True, description="Nome da ração utilizada para alimentar o pet.")
     frequency = PositiveIntegerField(required=True, description="Quantidade de vezes que deve alimentar o animal por dia.")
     observations = String(required=False, description="Observações importantes.")
@@ -48,10 +51,10 @@ class CreatePetInput(graphene.InputObjectType):
     """
 
     name = String(required=True, description="Nome do animal de estimação.")
-    kind = String(required=True, description="Tipo do animal de estimação (CAT, DOG).")
-    sex = String(required=True, description="Sexo do animal de estimação (FEMALE, MALE).")
-    height = String(required=True, description="Porte do animal de estimação (SMALL, MEDIUM, BIG).")
-    temperament = String(required=True, description="Temperamento do animal de estimação (DOCILE, FRIENDLY, BRAVE).")
+    kind = PetTypeField(required=True, description="Tipo do animal de estimação (CAT, DOG).")
+    sex = PetSexField(required=True, description="Sexo do animal de estimação (FEMALE, MALE).")
+    height = PetSizeField(required=True, description="Porte do animal de estimação (SMALL, MEDIUM, BIG).")
+    temperament = PetTemperamentField(required=True, description="Temperamento do animal de estimação (DOCILE, FRIENDLY, BRAVE).")
     age = PositiveIntegerField(required=False, description="Idade do animal de estimação.")
     breed = String(required=False, description="Raça do animal de estimação.")
     photo = Upload(required=False, description="Foto do animal de estimação.")
@@ -92,7 +95,12 @@ class CreatePetMutation(graphene.Mutation):
             required=True
         )
 
-    def mutate(self, info, data):
+        idempotency_key = String(
+            description="Chave única da requisição. Repetir a chave retorna o pet já criado em vez de criar outro.",
+            required=False
+        )
+
+    def mutate(self, info, data, idempotency_key=None):
         """
         Mutações
         """
@@ -101,6 +109,18 @@ class CreatePetMutation(graphene.Mutation):
 
         GenericPermissions.auth_validation(logged_user)
 
-        pet = CreatePetsResolver(logged_user, data).get_result()
+        store = IdempotencyStore(logged_user, 'create_pet', idempotency_key, data)
+        saved = store.begin()
+
+        if saved is not None:
+            return CreatePetMutation(pet=Pet.objects.filter(id=saved['pet']).first())
+
+        try:
+            pet = CreatePetsResolver(logged_user, data).get_result()
+        except Exception:
+            store.cancel()
+            raise
+
+        store.finish({'pet': pet.id})
 
         return CreatePetMutation(pet=pet)
@@ -2,6 +2,7 @@ from graphene_file_upload.scalars import Upload
 from common.scalars import DateField, PhoneField, PositiveIntegerField, PositiveFloatField
 from common.utils import GenericUtils
 from common.permissions import GenericPermissions
+from petguard.pets.scalars import PetTypeField, PetSexField, PetSizeField, PetTemperamentField
 from petguard.pets.resolvers import UpdatePetsResolver
 from petguard.pets.types import PetType
 from graphene.types import String, Int, Boolean, Field
@@ -13,7 +14,7 @@ class UpdateAlimentationInput(graphene.InputObjectType):
     Classe responsável pelos campos de atualização da alimentação do pet.
     """
 
-    qtd = String(required=False, description="Quantidade de ração diaria (SMALL, MEDIUM, BIG).")
+    qtd = PetSizeField(required=False, description="Quantidade de ração diaria (SMALL, MEDIUM, BIG).")
     food = String(required=False, description="Nome da ração utilizada para alimentar o pet.")
     frequency = PositiveIntegerField(required=False, description="Quantidade de vezes que deve alimentar o animal por dia.")
     observations = String(required=False, description="Observações importantes.")
@@ -48,10 +49,10 @@ class UpdatePetInput(graphene.InputObjectType):
     """
 
     name = String(required=False, description="Nome do animal de estimação.")
-    kind = String(required=False, description="Tipo do animal de estimação (CAT, DOG).")
-    sex = String(required=False, description="Sexo do animal de estimação (FEMALE, MALE).")
-    height = String(required=False, description="Porte do animal de estimação (SMALL, MEDIUM, BIG).")
-    temperament = String(required=False, description="Temperamento do animal de estimação (DOCILE, FRIENDLY, BRAVE).")
+    kind = PetTypeField(required=False, description="Tipo do animal de estimação (CAT, DOG).")
+    sex = PetSexField(required=False, description="Sexo do animal de estimação (FEMALE, MALE).")
+    height = PetSizeField(required=False, description="Porte do animal de estimação (SMALL, MEDIUM, BIG).")
+    temperament = PetTemperamentField(required=False, description="Temperamento do animal de estimação (DOCILE, FRIENDLY, BRAVE).")
     age = PositiveIntegerField(required=False, description="Idade do animal de estimação.")
     breed = String(required=False, description="Raça do animal de estimação.")
     photo = Upload(required=False, description="Foto do animal de estimação.")
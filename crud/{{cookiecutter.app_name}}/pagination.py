@@ -0,0 +1,181 @@
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from common.exceptions import CustomError
+from .conf import PetSettings
+from .caching import PetResultCache
+import base64
+import binascii
+import hashlib
+import json
+
+
+class KeysetPaginator:
+    """
+    Paginação por cursor (keyset) baseada na ordenação da modelo.
+    """
+
+    def __init__(self, model):
+        """
+        Construtor
+        """
+
+        self.model = model
+        self.ordering = []
+
+        for name in list(model._meta.ordering) + [model._meta.pk.name]:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+
+            if name == 'pk':
+                name = model._meta.pk.name
+
+            if name not in [field for field, _ in self.ordering]:
+                self.ordering.append((name, descending))
+
+    @property
+    def fields(self):
+        """
+        Nomes dos campos que compõem o cursor.
+        """
+
+        return tuple(name for name, _ in self.ordering)
+
+    @property
+    def order_by(self):
+        """
+        Ordenação no formato do order_by do Django.
+
+        Usa a coluna (attname) para uma chave estrangeira não seguir a
+        ordenação da modelo relacionada, o que faria um join.
+        """
+
+        columns = [
+            (self.model._meta.get_field(name).attname, descending)
+            for name, descending in self.ordering
+        ]
+
+        return [f"-{column}" if descending else column for column, descending in columns]
+
+    def order(self, queryset):
+        """
+        Ordena o queryset de forma determinística pelos campos do cursor.
+        """
+
+        return queryset.order_by(*self.order_by)
+
+    def encode(self, obj):
+        """
+        Gera o cursor opaco de um objeto.
+        """
+
+        values = [
+            self.model._meta.get_field(name).value_to_string(obj)
+            for name in self.fields
+        ]
+
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode(self, cursor):
+        """
+        Pega os valores dos campos a partir do cursor.
+        """
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(cursor)
+
+            return [
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise CustomError(
+                message="O cursor de paginação passado é inválido.",
+                cause=f"Valor passado: {cursor}"
+            )
+
+    def after(self, queryset, cursor):
+        """
+        Filtra os objetos que estão depois do cursor na ordenação.
+        """
+
+        values = self.decode(cursor)
+        condition = Q()
+
+        for index, (name, descending) in enumerate(self.ordering):
+            lookup = {
+                previous: values[position]
+                for position, (previous, _) in enumerate(self.ordering[:index])
+            }
+            lookup[f"{name}__{'lt' if descending else 'gt'}"] = values[index]
+            condition |= Q(**lookup)
+
+        return queryset.filter(condition)
+
+
+class QuerysetCounter:
+    """
+    Conta os objetos de um queryset sem rodar um COUNT(*) completo em listagens grandes.
+
+    Até PETS_COUNT_THRESHOLD objetos a contagem é exata. Acima disso usa a
+    estimativa do planejador do PostgreSQL ou uma contagem guardada em cache.
+    A contagem guardada usa as versões dos escopos da listagem (ver
+    PetResultCache), então criar ou remover pets troca a chave na hora.
+    """
+
+    def __init__(self, queryset, scopes=()):
+        """
+        Construtor
+        """
+
+        self.queryset = queryset.order_by()
+        self.scopes = list(scopes)
+        self.threshold = PetSettings.get('PETS_COUNT_THRESHOLD')
+
+    def __get_estimate(self):
+        """
+        Pega a estimativa de linhas do planejador, se o banco suportar.
+        """
+
+        if connections[self.queryset.db].vendor != 'postgresql':
+            return None
+
+        plan = json.loads(self.queryset.explain(format='json'))
+
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def __get_cached(self):
+        """
+        Pega a contagem exata guardada em cache.
+        """
+
+        sql, params = self.queryset.query.sql_with_params()
+        versions = PetResultCache.get_versions(self.scopes)
+        key = hashlib.md5(repr((sql, params, self.scopes, versions)).encode()).hexdigest()
+
+        return cache.get_or_set(
+            f"pets:count:{key}",
+            self.queryset.count,
+            PetSettings.get('PETS_COUNT_CACHE_TIMEOUT')
+        )
+
+    def count(self):
+        """
+        Resultado da contagem.
+        """
+
+        total = self.queryset[:self.threshold + 1].count()
+
+        if total <= self.threshold:
+            return total
+
+        estimate = self.__get_estimate()
+
+        if estimate is not None:
+            return max(estimate, total)
+
+        return self.__get_cached()
@@ -0,0 +1,301 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps, features
+from .conf import PetSettings
+from .models import Pet
+from .caching import PetResultCache
+import logging
+import posixpath
+import re
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class PhotoPipeline:
+    """
+    Processamento assíncrono das fotos dos pets (PETS_PHOTO_PIPELINE).
+
+    Na requisição a foto original só é gravada na pasta de staging do storage
+    da foto. Depois do commit um pool de workers gera as versões (larguras de
+    PETS_PHOTO_WIDTHS nos formatos de PETS_PHOTO_FORMATS) e troca a foto do pet
+    pela maior versão com um único UPDATE, somente se o pet ainda aponta para o
+    mesmo original. O storage padrão do Django (sistema de arquivos local) é
+    suficiente para o worker rodar offline.
+    """
+
+    # Formato do Pillow e extensão de cada formato aceito.
+    formats = {
+        'jpeg': ('JPEG', 'jpg'),
+        'webp': ('WEBP', 'webp'),
+    }
+
+    # Nome das versões geradas por process: <pasta>/<id do pet>/<token>_<larguras>_<formatos>_<largura>.<extensão>.
+    # As larguras e formatos gravados ficam no próprio nome, sem depender do settings atual.
+    pattern = re.compile(
+        r'^(?P<token>[0-9a-f]{16})_(?P<widths>\d+(?:-\d+)*)_(?P<formats>[a-z]+(?:-[a-z]+)*)_\d+\.[a-z]+$'
+    )
+
+    executor = None
+
+    @staticmethod
+    def is_enabled():
+        """
+        Verifica se o processamento assíncrono das fotos está habilitado.
+        """
+
+        return PetSettings.get('PETS_PHOTO_PIPELINE')
+
+    @staticmethod
+    def get_storage():
+        """
+        Storage do campo de foto do pet.
+        """
+
+        return Pet._meta.get_field('photo').storage
+
+    @classmethod
+    def get_executor(cls):
+        """
+        Pool de workers do processo, criado no primeiro uso.
+
+        Com PETS_PHOTO_WORKERS 0 as fotos ficam para o comando process_<modelo>_photos.
+        """
+
+        workers = PetSettings.get('PETS_PHOTO_WORKERS')
+
+        if not workers:
+            return None
+
+        if cls.executor is None:
+            cls.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pets-photos')
+
+        return cls.executor
+
+    @staticmethod
+    def is_staged(name):
+        """
+        Verifica se a foto ainda é o original na pasta de staging.
+        """
+
+        return bool(name) and posixpath.basename(posixpath.dirname(name)) == PetSettings.get('PETS_PHOTO_STAGING_DIR')
+
+    @classmethod
+    def get_formats(cls):
+        """
+        Formatos configurados que o Pillow instalado consegue gravar (no mínimo JPEG).
+        """
+
+        return [
+            name for name in PetSettings.get('PETS_PHOTO_FORMATS')
+            if name in cls.formats and (name != 'webp' or features.check('webp'))
+        ] or ['jpeg']
+
+    @classmethod
+    def get_variants(cls, name, identify):
+        """
+        Versões (largura, formato, nome) de uma foto processada do pet.
+
+        Somente nomes gerados por process, na pasta do próprio pet, têm versões.
+        Fotos antigas ou de outro pet retornam uma lista vazia.
+        """
+
+        directory, basename = posixpath.split(name or '')
+        match = cls.pattern.match(basename)
+
+        if match is None or posixpath.basename(directory) != str(identify):
+            return []
+
+        formats = match['formats'].split('-')
+
+        if not all(fmt in cls.formats for fmt in formats):
+            return []
+
+        base = posixpath.join(directory, f"{match['token']}_{match['widths']}_{match['formats']}")
+        variants = [
+            (width, fmt, f"{base}_{width}.{cls.formats[fmt][1]}")
+            for width in map(int, match['widths'].split('-'))
+            for fmt in formats
+        ]
+
+        return variants if variants[0][2] == name else []
+
+    @classmethod
+    def stage(cls, *pets):
+        """
+        Direciona as fotos novas (ainda não enviadas) para a pasta de staging.
+
+        Deve ser chamado antes de salvar. Retorna os pets com foto nova.
+        """
+
+        if not cls.is_enabled():
+            return []
+
+        staged = []
+
+        for pet in pets:
+            photo = pet.photo
+
+            if photo and not getattr(photo, '_committed', True):
+                extension = posixpath.splitext(photo.name)[1].lower()
+                photo.name = posixpath.join(PetSettings.get('PETS_PHOTO_STAGING_DIR'), f"{uuid.uuid4().hex}{extension}")
+                staged.append(pet)
+
+        return staged
+
+    @classmethod
+    def schedule(cls, *pets):
+        """
+        Envia as fotos em staging dos pets salvos para os workers depois do commit.
+        """
+
+        jobs = [(pet.id, pet.photo.name) for pet in pets if cls.is_staged(pet.photo.name)]
+
+        def submit():
+            executor = cls.get_executor()
+
+            if executor is not None:
+                for job in jobs:
+                    executor.submit(cls.__run, *job)
+
+        if jobs:
+            transaction.on_commit(submit)
+
+    @classmethod
+    def __run(cls, identify, name):
+        """
+        Tarefa do worker: processa a foto e fecha as conexões da thread.
+        """
+
+        try:
+            cls.process(identify, name)
+        except Exception:
+            logger.exception("Falha ao processar a foto %s do pet %s.", name, identify)
+        finally:
+            connections.close_all()
+
+    @classmethod
+    def __render(cls, image, width, fmt):
+        """
+        Gera o conteúdo de uma versão da foto, sem aumentar imagens menores que a largura.
+        """
+
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format=cls.formats[fmt][0], quality=PetSettings.get('PETS_PHOTO_QUALITY'), optimize=True)
+
+        return ContentFile(buffer.getvalue())
+
+    @classmethod
+    def __swap(cls, identify, name, target, files):
+        """
+        Troca a foto do pet pelo alvo, somente se ainda for o original em staging.
+
+        Sem a troca os arquivos gerados são descartados. O original é sempre apagado.
+        """
+
+        storage = cls.get_storage()
+
+        # Compare-and-swap: só troca se a foto ainda for o original processado.
+        swapped = Pet._base_manager.filter(id=identify, photo=name).update(photo=target)
+
+        if swapped:
+            pet = Pet._base_manager.only('id', 'owner', 'ong').get(id=identify)
+            PetResultCache.invalidate(pet)
+        else:
+            for file in files:
+                storage.delete(file)
+
+        storage.delete(name)
+
+        return bool(swapped)
+
+    @classmethod
+    def __discard(cls, identify, name):
+        """
+        Move um original que não pôde ser aberto para a pasta do pet, sem versões.
+
+        Assim a foto sai do staging e não trava o processamento das próximas.
+        Se o original nem existe mais, a foto do pet é limpa.
+        """
+
+        storage = cls.get_storage()
+        token, extension = posixpath.splitext(posixpath.basename(name))
+        target = posixpath.join(posixpath.dirname(posixpath.dirname(name)), str(identify), f"{token}{extension}")
+
+        try:
+            with storage.open(name) as source:
+                target = storage.save(target, ContentFile(source.read()))
+        except OSError:
+            target = ''
+
+        return cls.__swap(identify, name, target, [target] if target else [])
+
+    @classmethod
+    def process(cls, identify, name):
+        """
+        Gera as versões da foto em staging e troca a foto do pet de forma atômica.
+
+        Retorna se a troca foi feita. Se o pet foi removido ou recebeu outra foto
+        nesse meio tempo, as versões geradas são descartadas. Um original que não
+        é uma imagem válida é movido para fora do staging, sem versões.
+        """
+
+        storage = cls.get_storage()
+
+        try:
+            with storage.open(name) as source:
+                image = ImageOps.exif_transpose(Image.open(source))
+                image = image.convert('RGB')
+        except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+            logger.exception("Foto %s do pet %s inválida, movida para fora do staging.", name, identify)
+            cls.__discard(identify, name)
+
+            return False
+
+        token = posixpath.splitext(posixpath.basename(name))[0][:16]
+        widths = sorted(set(PetSettings.get('PETS_PHOTO_WIDTHS')), reverse=True)
+        formats = list(dict.fromkeys(cls.get_formats()))
+        base = posixpath.join(
+            posixpath.dirname(posixpath.dirname(name)),
+            str(identify),
+            f"{token}_{'-'.join(map(str, widths))}_{'-'.join(formats)}"
+        )
+        names = [
+            storage.save(variant, cls.__render(image, width, fmt))
+            for width, fmt, variant in cls.get_variants(f"{base}_{widths[0]}.{cls.formats[formats[0]][1]}", identify)
+        ]
+
+        return cls.__swap(identify, name, names[0], names)
+
+    @classmethod
+    def process_pending(cls, limit=None):
+        """
+        Processa as fotos que ainda estão em staging (sem workers ou após uma falha).
+
+        Retorna a quantidade de fotos trocadas.
+        """
+
+        queryset = Pet._base_manager.filter(
+            photo__contains=f"{PetSettings.get('PETS_PHOTO_STAGING_DIR')}/"
+        ).values_list('id', 'photo').order_by('id')
+
+        if limit:
+            queryset = queryset[:limit]
+
+        processed = 0
+
+        for identify, name in queryset:
+            if not cls.is_staged(name):
+                continue
+
+            try:
+                processed += cls.process(identify, name)
+            except Exception:
+                logger.exception("Falha ao processar a foto %s do pet %s.", name, identify)
+
+        return processed
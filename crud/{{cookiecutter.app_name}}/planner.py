@@ -0,0 +1,164 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.base import ModelState
+from graphene.utils.str_converters import to_snake_case
+
+
+class QueryPlanner:
+    """
+    Ajusta um queryset aos campos pedidos na consulta GraphQL.
+    """
+
+    def __init__(self, model, info, field_map=None, path=(), fields=()):
+        """
+        Construtor
+        """
+
+        self.model = model
+        self.info = info
+        self.field_map = field_map or {}
+        self.path = path
+        self.fields = fields
+        self.columns = None
+
+    def __get_field_nodes(self):
+        """
+        Pega os nós do campo atual (graphql-core 2 ou 3).
+        """
+
+        return getattr(self.info, 'field_nodes', None) or self.info.field_asts
+
+    def __collect(self, selection_set):
+        """
+        Transforma o selection set em um dicionário de campos e seus filhos.
+        """
+
+        selection = {}
+
+        if selection_set is None:
+            return selection
+
+        for node in selection_set.selections:
+            kind = type(node).__name__
+
+            if kind.startswith('FragmentSpread'):
+                fragment = self.info.fragments[node.name.value]
+                selection.update(self.__collect(fragment.selection_set))
+            elif kind.startswith('InlineFragment'):
+                selection.update(self.__collect(node.selection_set))
+            elif not node.name.value.startswith('__'):
+                name = to_snake_case(node.name.value)
+                children = self.__collect(node.selection_set) if node.selection_set else None
+                selection[name] = children
+
+        return selection
+
+    def get_selection(self):
+        """
+        Pega os campos pedidos pelo cliente a partir do campo atual.
+        """
+
+        selection = {}
+
+        for node in self.__get_field_nodes():
+            selection.update(self.__collect(node.selection_set))
+
+        for name in self.path:
+            selection = selection.get(name) or {}
+
+        return selection
+
+    @staticmethod
+    def __get_concrete_names(model, selection):
+        """
+        Pega os nomes das colunas simples pedidas de uma modelo relacionada.
+
+        Retorna None se algum campo não for uma coluna simples, pois nesse
+        caso o tipo pode precisar de qualquer atributo da modelo.
+        """
+
+        names = []
+
+        for name in selection or {}:
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+
+            if field.is_relation or not field.concrete:
+                return None
+
+            names.append(name)
+
+        return names
+
+    def apply(self, queryset):
+        """
+        Aplica select_related, prefetch_related e only no queryset.
+        """
+
+        only, related, prefetch = list(self.fields), [], []
+        projection = True
+
+        for name, children in self.get_selection().items():
+            for model_field in self.field_map.get(name, (name,)):
+                try:
+                    field = self.model._meta.get_field(model_field)
+                except FieldDoesNotExist:
+                    projection = False
+                    continue
+
+                if field.many_to_many or field.one_to_many:
+                    prefetch.append(model_field)
+                elif field.is_relation and field.concrete:
+                    related.append(model_field)
+                    only.append(model_field)
+
+                    nested = self.__get_concrete_names(field.related_model, children)
+
+                    if nested:
+                        only.extend(f"{model_field}__{nested_name}" for nested_name in nested)
+                elif field.is_relation:
+                    related.append(model_field)
+                    projection = False
+                else:
+                    only.append(model_field)
+
+        if related:
+            queryset = queryset.select_related(*related)
+
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        if projection and only:
+            queryset = queryset.only(*only)
+
+        # Sem relações a listagem pode ser lida direto das colunas (ver read).
+        if projection and only and not related and not prefetch:
+            self.columns = list(dict.fromkeys([self.model._meta.pk.name, *only]))
+
+        return queryset
+
+    def read(self, queryset):
+        """
+        Lê os objetos do queryset planejado.
+
+        Quando o cliente pede somente colunas simples, monta os objetos a partir
+        do values_list, sem passar pelo __init__ da modelo nem pelos sinais de
+        inicialização. Colunas não pedidas continuam adiadas (deferred).
+        """
+
+        if self.columns is None:
+            return list(queryset)
+
+        attnames = [self.model._meta.get_field(name).attname for name in self.columns]
+        objs = []
+
+        for values in queryset.values_list(*attnames):
+            obj = self.model.__new__(self.model)
+            obj._state = ModelState()
+            obj._state.adding = False
+            obj._state.db = queryset.db
+            obj.__dict__.update(zip(attnames, values))
+            objs.append(obj)
+
+        return objs
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .conf import PetSettings
+from .models import Pet, Alimentation, SpecialCares
+from .photos import PhotoPipeline
+
+
+class PetPurge:
+    """
+    Remoção de pets: soft delete (quando a modelo tem deleted_at) e remoção definitiva em lote.
+    """
+
+    # Colunas necessárias para apagar as relações, a foto e invalidar o cache.
+    fields = ('id', 'owner', 'ong', 'alimentation', 'special_cares', 'photo')
+
+    @staticmethod
+    def is_soft_delete():
+        """
+        Verifica se a modelo foi gerada com a opção soft_delete.
+        """
+
+        return any(field.name == 'deleted_at' for field in Pet._meta.concrete_fields)
+
+    @staticmethod
+    def __delete_files(names):
+        """
+        Apaga as fotos do storage.
+        """
+
+        storage = Pet._meta.get_field('photo').storage
+
+        for name in names:
+            storage.delete(name)
+
+    @classmethod
+    def soft_delete(cls, queryset):
+        """
+        Marca os pets como removidos com um único UPDATE e retorna a quantidade.
+        """
+
+        return queryset.update(deleted_at=timezone.now())
+
+    @classmethod
+    def delete(cls, pets):
+        """
+        Apaga definitivamente os pets e suas relações com DELETEs por conjunto.
+
+        O delete do queryset segue o on_delete das tabelas que apontam para o
+        pet (inclusive de outros apps) e dispara os sinais de remoção. As
+        fotos, com as versões processadas, são apagadas do storage depois do
+        commit.
+        """
+
+        identifies = [pet.id for pet in pets]
+
+        if not identifies:
+            return 0
+
+        with transaction.atomic():
+            _, removed = Pet._base_manager.filter(id__in=identifies).delete()
+            Alimentation.objects.filter(
+                id__in=[pet.alimentation_id for pet in pets if pet.alimentation_id]
+            ).delete()
+            SpecialCares.objects.filter(
+                id__in=[pet.special_cares_id for pet in pets if pet.special_cares_id]
+            ).delete()
+
+            names = {
+                name
+                for pet in pets if pet.photo
+                for name in [pet.photo.name, *(variant for _, _, variant in PhotoPipeline.get_variants(pet.photo.name, pet.id))]
+            }
+            transaction.on_commit(lambda: cls.__delete_files(names))
+
+        return removed.get(Pet._meta.label, 0)
+
+    @classmethod
+    def purge(cls, batch_size=None, retention_days=None):
+        """
+        Apaga definitivamente, em lotes, os pets removidos há mais dias que a retenção.
+
+        Feito para rodar fora do horário de pico (ver o comando purge_<modelo>).
+        Cada lote é uma transação curta, para não segurar locks por muito tempo.
+        """
+
+        if not cls.is_soft_delete():
+            return 0
+
+        batch_size = batch_size or PetSettings.get('PETS_PURGE_BATCH_SIZE')
+
+        if retention_days is None:
+            retention_days = PetSettings.get('PETS_PURGE_RETENTION_DAYS')
+
+        limit = timezone.now() - timedelta(days=retention_days)
+        queryset = Pet._base_manager.filter(deleted_at__lt=limit).only(*cls.fields).order_by('deleted_at')
+        total = 0
+
+        while True:
+            pets = list(queryset[:batch_size])
+
+            if not pets:
+                return total
+
+            removed = cls.delete(pets)
+
+            # Nada removido (ex.: outro processo já apagou o lote), evita repetir para sempre.
+            if not removed:
+                return total
+
+            total += removed
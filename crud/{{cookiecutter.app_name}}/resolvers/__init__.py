@@ -1,6 +1,9 @@
 # flake8: noqa
 from .create_pets import CreatePetsResolver
+from .bulk_create_pets import BulkCreatePetsResolver
 from .update_pets import UpdatePetsResolver
+from .bulk_update_pets import BulkUpdatePetsResolver
 from .delete_pets import DeletePetsResolver
+from .bulk_delete_pets import BulkDeletePetsResolver
 from .list_pets import ListPetResolver
 from .fetch_pets import FetchPetResolver
@@ -0,0 +1,119 @@
+from django.db import connections, transaction
+from common.exceptions import CustomError
+from petguard.pets.models import Pet, Alimentation, SpecialCares
+from petguard.pets.resolvers.create_pets import CreatePetsResolver
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.conf import PetSettings
+from petguard.pets.validators import PetValidators
+from petguard.pets.photos import PhotoPipeline
+
+
+class BulkCreatePetsResolver:
+    """
+    Classe responsável pela lógica de criação de vários pets de uma vez.
+
+    Todos os itens são validados antes de qualquer escrita e as linhas de cada
+    tabela (alimentação, cuidados especiais e pets) são inseridas com um único
+    bulk_create dentro de uma transação.
+    """
+
+    def __init__(self, user, data, partial=False):
+        """
+        Construtor
+        """
+
+        self.data = data
+        self.partial = partial
+        self.errors = []
+
+        self.__validate_size()
+
+        user_type = Pet.objects.get_user_type(user)
+
+        self.resolvers = [CreatePetsResolver(user, item, user_type) for item in data]
+
+    def __validate_size(self):
+        """
+        Limita a quantidade de pets criados em uma única requisição.
+        """
+
+        limit = PetSettings.get('PETS_BULK_MAX_SIZE')
+
+        if len(self.data) > limit:
+            raise CustomError(
+                message="A quantidade de pets passada é maior que o limite permitido.",
+                cause=f"Limite: {limit}"
+            )
+
+    def __build(self):
+        """
+        Valida todos os itens em uma passada e monta os válidos.
+
+        Sem o modo parcial o primeiro erro cancela o lote inteiro. No modo
+        parcial os itens inválidos são guardados em errors e os válidos seguem.
+        """
+
+        errors = PetValidators.pet.validate_many(self.data)
+
+        if errors and not self.partial:
+            raise next(iter(errors.values()))
+
+        self.errors = [
+            {
+                'index': index,
+                'message': getattr(error, 'message', str(error)),
+                'cause': getattr(error, 'cause', '')
+            }
+            for index, error in errors.items()
+        ]
+
+        return [
+            resolver.build()
+            for index, resolver in enumerate(self.resolvers)
+            if index not in errors
+        ]
+
+    @staticmethod
+    def __insert(model, objs):
+        """
+        Insere os objetos com um único INSERT.
+
+        Os ids são necessários para ligar os pets a alimentação e cuidados
+        especiais, então bancos que não retornam as linhas inseridas salvam um a um.
+        """
+
+        if not objs:
+            return
+
+        if connections[model.objects.db].features.can_return_rows_from_bulk_insert:
+            model.objects.bulk_create(objs)
+        else:
+            for obj in objs:
+                obj.save()
+
+    def get_result(self):
+        """
+        Resultado do resolver.
+        """
+
+        items = self.__build()
+        staged = PhotoPipeline.stage(*[pet for pet, _, _ in items])
+
+        with transaction.atomic():
+            self.__insert(Alimentation, [alimentation for _, alimentation, _ in items if alimentation])
+            self.__insert(SpecialCares, [special_cares for _, _, special_cares in items if special_cares])
+
+            for pet, alimentation, special_cares in items:
+                pet.alimentation = alimentation
+                pet.special_cares = special_cares
+
+            pets = [pet for pet, _, _ in items]
+
+            self.__insert(Pet, pets)
+            PhotoPipeline.schedule(*staged)
+
+        AdoptionFeed.sync(*pets)
+        PetResultCache.invalidate(*pets)
+
+        return pets
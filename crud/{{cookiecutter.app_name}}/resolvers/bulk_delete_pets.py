@@ -0,0 +1,73 @@
+from common.exceptions import CustomError
+from petguard.pets.models import Pet
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.conf import PetSettings
+from petguard.pets.purge import PetPurge
+
+
+class BulkDeletePetsResolver:
+    """
+    Classe responsável pela lógica de deleção de vários pets de uma vez.
+
+    Os pets do usuário são removidos com DELETEs por conjunto (um por tabela),
+    ou com um único UPDATE no soft delete, sem buscar e deletar cada pet e
+    suas relações um a um.
+    """
+
+    def __init__(self, user, identifies):
+        """
+        Construtor
+        """
+
+        self.identifies = list(dict.fromkeys(identifies))
+
+        self.__validate_size()
+
+        self.user, self.ong = Pet.objects.get_user_type(user)
+        self.not_found = []
+
+    def __validate_size(self):
+        """
+        Limita a quantidade de pets removidos em uma única requisição.
+        """
+
+        limit = PetSettings.get('PETS_BULK_MAX_SIZE')
+
+        if len(self.identifies) > limit:
+            raise CustomError(
+                message="A quantidade de pets passada é maior que o limite permitido.",
+                cause=f"Limite: {limit}"
+            )
+
+    def __get_queryset(self):
+        """
+        Pets passados que pertencem ao usuário logado (a posse é verificada no SQL).
+        """
+
+        owner = 'ong' if self.ong else 'owner'
+
+        return Pet.objects.filter(id__in=self.identifies, **{owner: self.user})
+
+    def get_result(self):
+        """
+        Resultado do resolver: quantidade de pets removidos.
+        """
+
+        pets = list(self.__get_queryset().only(*PetPurge.fields))
+        found = {pet.id for pet in pets}
+
+        self.not_found = [identify for identify in self.identifies if identify not in found]
+
+        if not pets:
+            return 0
+
+        if PetPurge.is_soft_delete():
+            removed = PetPurge.soft_delete(self.__get_queryset())
+            AdoptionFeed.remove(*found)
+        else:
+            removed = PetPurge.delete(pets)
+
+        PetResultCache.invalidate(*pets)
+
+        return removed
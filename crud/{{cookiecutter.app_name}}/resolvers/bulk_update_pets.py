@@ -0,0 +1,114 @@
+from django.db import transaction
+from common.exceptions import CustomError
+from petguard.pets.models import Pet
+from petguard.pets.resolvers.update_pets import UpdatePetsResolver
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.conf import PetSettings
+from petguard.pets.tracking import FieldTracker
+from petguard.pets.validators import PetValidators
+from petguard.pets.photos import PhotoPipeline
+
+
+class BulkUpdatePetsResolver:
+    """
+    Classe responsável pela lógica de atualização de vários pets de uma vez.
+
+    Todos os pets são carregados em uma consulta que já verifica a posse, e
+    as alterações são salvas com um bulk_update por modelo e por conjunto de
+    colunas alteradas dentro de uma transação.
+    """
+
+    def __init__(self, user, data):
+        """
+        Construtor
+        """
+
+        self.data = data
+
+        self.__validate_size()
+
+        self.user, self.ong = Pet.objects.get_user_type(user)
+
+        pets = self.__get_pets()
+
+        self.resolvers = [
+            UpdatePetsResolver(user, item.get('identify'), item.get('data'), pets[item.get('identify')])
+            for item in data
+        ]
+
+    def __validate_size(self):
+        """
+        Limita a quantidade de pets atualizados em uma única requisição.
+        """
+
+        limit = PetSettings.get('PETS_BULK_MAX_SIZE')
+
+        if len(self.data) > limit:
+            raise CustomError(
+                message="A quantidade de pets passada é maior que o limite permitido.",
+                cause=f"Limite: {limit}"
+            )
+
+    def __get_pets(self):
+        """
+        Pega todos os pets do usuário logado em uma consulta.
+        """
+
+        identifies = [item.get('identify') for item in self.data]
+        owner = 'ong' if self.ong else 'owner'
+        seen = set()
+
+        # Cada pet é alterado por um único item, pois os itens repetidos dividiriam a mesma instância.
+        for identify in identifies:
+            if identify in seen:
+                raise CustomError(
+                    message="O mesmo pet foi passado mais de uma vez.",
+                    cause=f"ID: {identify}"
+                )
+
+            seen.add(identify)
+
+        pets = Pet.objects.select_related('alimentation', 'special_cares').filter(
+            **{owner: self.user}
+        ).in_bulk(identifies)
+
+        for identify in identifies:
+            if identify not in pets:
+                raise CustomError(
+                    message="Não foi encontrado o pet com o identificador passado.",
+                    cause=f"ID: {identify}"
+                )
+
+        return pets
+
+    def get_result(self):
+        """
+        Resultado do resolver.
+        """
+
+        # Valida todos os itens em uma passada antes de escrever qualquer linha.
+        errors = PetValidators.pet.validate_many([resolver.pet for resolver in self.resolvers])
+
+        if errors:
+            raise next(iter(errors.values()))
+
+        pets = [resolver.pet for resolver in self.resolvers]
+        staged = PhotoPipeline.stage(*pets)
+
+        with transaction.atomic():
+            changed = FieldTracker.bulk_save([pet.alimentation for pet in pets if pet.alimentation])
+            changed += FieldTracker.bulk_save([pet.special_cares for pet in pets if pet.special_cares])
+            changed += FieldTracker.bulk_save(pets)
+            PhotoPipeline.schedule(*staged)
+
+        changed = {id(obj) for obj in changed}
+        changed_pets = [
+            pet for pet in pets
+            if any(id(obj) in changed for obj in (pet, pet.alimentation, pet.special_cares))
+        ]
+
+        AdoptionFeed.sync(*changed_pets)
+        PetResultCache.invalidate(*changed_pets)
+
+        return pets
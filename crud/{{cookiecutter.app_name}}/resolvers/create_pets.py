@@ -1,9 +1,11 @@
-from common.validations import GenericValidations
+from django.db import transaction
 from petguard.pets.models import Pet, Alimentation, SpecialCares
-from petguard.pets.enum import (
-    PetTypeEnum, PetSexEnum, PetSizeEnum,
-    PetTemperamentEnum
-)
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.validators import PetValidators
+from petguard.pets.returning import InsertReturning
+from petguard.pets.conf import PetSettings
+from petguard.pets.photos import PhotoPipeline
 
 
 class CreatePetsResolver:
@@ -11,12 +13,16 @@ class CreatePetsResolver:
     Classe responsável pela lógica de criação de pets
     """
 
-    def __init__(self, user, data):
+    def __init__(self, user, data, user_type=None):
         """
         Construtor
+
+        O user_type (retorno de Pet.objects.get_user_type) pode ser passado para
+        não consultar o tipo do usuário novamente na criação em lote.
         """
 
-        self.user, self.ong = Pet.objects.get_user_type(user)
+        self.user, self.ong = user_type or Pet.objects.get_user_type(user)
+        self.data = data
 
         self.name = data.get('name')
         self.kind = data.get('kind')
@@ -67,34 +73,11 @@ class CreatePetsResolver:
             self.last_estro = self.special_cares.get('last_estro', None)
             self.observations = self.special_cares.get('observations', '')
 
-    def __validations(self):
-        """
-        Valida alguns dados de entrada.
-        """
-
-        GenericValidations.validate_required_field("name", self.name)
-        GenericValidations.validate_required_field("kind", self.kind)
-        GenericValidations.belongs_to_enum(PetTypeEnum, self.kind)
-        GenericValidations.validate_required_field("sex", self.sex)
-        GenericValidations.belongs_to_enum(PetSexEnum, self.sex)
-        GenericValidations.validate_required_field("height", self.height)
-        GenericValidations.belongs_to_enum(PetSizeEnum, self.height)
-        GenericValidations.validate_required_field("temperament", self.temperament)
-        GenericValidations.belongs_to_enum(PetTemperamentEnum, self.temperament)
-
-        if self.alimentation:
-            GenericValidations.validate_required_field("qtd", self.qtd)
-            GenericValidations.belongs_to_enum(PetSizeEnum, self.qtd)
-            GenericValidations.validate_required_field("food", self.food)
-            GenericValidations.validate_required_field("frequency", self.frequency)
-
-    def get_result(self):
+    def build(self):
         """
-        Resultado do resolver.
+        Monta o pet, a alimentação e os cuidados especiais sem salvar (os dados já validados).
         """
 
-        self.__validations()
-
         pet = Pet(
             name=self.name,
             kind=self.kind,
@@ -114,17 +97,18 @@ class CreatePetsResolver:
         else:
             pet.owner = self.user
 
+        alimentation, special_cares = None, None
+
         if self.alimentation:
-            alimentation = Alimentation.objects.create(
+            alimentation = Alimentation(
                 qtd=self.qtd,
                 food=self.food,
                 frequency=self.frequency,
                 observations=self.observations
             )
-            pet.alimentation = alimentation
 
         if self.special_cares:
-            special_cases = SpecialCares.objects.create(
+            special_cares = SpecialCares(
                 veterinary_frequency=self.veterinary_frequency,
                 bathing_frequency=self.bathing_frequency,
                 diseases=self.diseases,
@@ -139,8 +123,36 @@ class CreatePetsResolver:
                 last_estro=self.last_estro,
                 observations=self.observations
             )
-            pet.special_cares = special_cases
 
-        pet.save()
+        return pet, alimentation, special_cares
+
+    def get_result(self):
+        """
+        Resultado do resolver.
+        """
+
+        PetValidators.pet.validate(self.data)
+
+        pet, alimentation, special_cares = self.build()
+        staged = PhotoPipeline.stage(pet)
+
+        with transaction.atomic():
+            if PetSettings.get('PETS_CREATE_SINGLE_STATEMENT') and InsertReturning.is_supported(Pet):
+                InsertReturning.insert(pet, {'alimentation': alimentation, 'special_cares': special_cares})
+            else:
+                if alimentation:
+                    alimentation.save()
+                    pet.alimentation = alimentation
+
+                if special_cares:
+                    special_cares.save()
+                    pet.special_cares = special_cares
+
+                pet.save()
+
+            AdoptionFeed.sync(pet)
+            PhotoPipeline.schedule(*staged)
+
+        PetResultCache.invalidate(pet)
 
         return pet
@@ -1,4 +1,10 @@
+from django.utils import timezone
+from common.exceptions import CustomError
 from petguard.pets.models import Pet
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.purge import PetPurge
+from petguard.pets.returning import UpdateReturning
 
 
 class DeletePetsResolver:
@@ -14,11 +20,43 @@ class DeletePetsResolver:
         self.user, self.ong = Pet.objects.get_user_type(user)
         self.identify = identify
 
+    def __soft_delete(self):
+        """
+        Marca o pet como removido com um UPDATE ... RETURNING, verificando a posse no SQL.
+
+        O dono e a ong retornados pela linha invalidam o cache dos dois lados.
+        Sem RETURNING no banco as colunas são lidas antes do UPDATE. A remoção
+        das relações e da foto fica para o purge.
+        """
+
+        owner = 'ong' if self.ong else 'owner'
+        queryset = Pet.objects.filter(id=self.identify, **{owner: self.user})
+
+        if UpdateReturning.is_supported(Pet):
+            pet = UpdateReturning.update(queryset, {'deleted_at': timezone.now()})
+        else:
+            pet = queryset.only('id', 'owner', 'ong').first()
+
+            if pet is not None and not PetPurge.soft_delete(queryset):
+                pet = None
+
+        if pet is None:
+            raise CustomError(
+                message="Não foi encontrado o pet com o identificador passado.",
+                cause=f"ID: {self.identify}"
+            )
+
+        AdoptionFeed.remove(pet.id)
+        PetResultCache.invalidate(pet)
+
     def get_result(self):
         """
         Resultado do resolver.
         """
 
+        if PetPurge.is_soft_delete():
+            return self.__soft_delete()
+
         if self.ong:
             pet = Pet.objects.get_pet_ong(self.identify, self.user)
         else:
@@ -31,3 +69,5 @@ class DeletePetsResolver:
             pet.special_cares.delete()
 
         pet.delete()
+
+        PetResultCache.invalidate(pet)
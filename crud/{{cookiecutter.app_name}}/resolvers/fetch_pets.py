@@ -1,4 +1,8 @@
+from common.exceptions import CustomError
 from petguard.pets.models import Pet
+from petguard.pets.identity import IdentityMap
+from petguard.pets.caching import PetResultCache
+from petguard.pets.conf import PetSettings
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,26 +13,86 @@ class FetchPetResolver:
     Classe responsável pela lógica de pegar um pet de um usuário.
     """
 
-    def __init__(self, identify, pet_id):
+    def __init__(self, identify, pet_id, info=None):
         """
         Construtor
         """
 
         self.identify = identify
         self.pet_id = pet_id
+        self.identity_map = IdentityMap.from_info(info)
 
-    def get_result(self):
+    def __get_pet(self, user, ong):
         """
-        Resultado do resolver.
+        Pega o pet já carregado na requisição ou busca no banco.
         """
 
-        account = User.objects.get_user(self.identify)
+        pet = self.identity_map.get(Pet, self.pet_id)
 
-        user, ong = Pet.objects.get_user_type(account)
+        if pet is not None and (pet.ong_id if ong else pet.owner_id) == user.id:
+            return pet
 
         if ong:
             pet = Pet.objects.get_pet_ong(self.pet_id, user)
         else:
             pet = Pet.objects.get_pet(self.pet_id, user)
 
+        return self.identity_map.add(pet)
+
+    def __get_cache_key(self):
+        """
+        Chave do pet no cache, por pet e conta. Ids que não são números não vão para o cache.
+        """
+
+        if PetResultCache.get_backend() is None or not str(self.pet_id).isdigit():
+            return None
+
+        return PetResultCache.get_key([f"pet:{int(self.pet_id)}"], {'fetch': self.identify})
+
+    def get_result(self):
+        """
+        Resultado do resolver.
+        """
+
+        key = self.__get_cache_key()
+        pet = PetResultCache.get(key)
+
+        if pet == PetResultCache.NOT_FOUND:
+            raise CustomError(
+                message="Não foi encontrado o pet com o identificador passado.",
+                cause=f"ID: {self.pet_id}"
+            )
+
+        if pet is not None:
+            return self.identity_map.add(pet)
+
+        pet = self.identity_map.get_or_load(
+            ('pet', str(self.pet_id), self.identify),
+            lambda: Pet.objects.get_pet_by_account(self.pet_id, self.identify)
+        )
+
+        if pet is not None:
+            pet = self.identity_map.add(pet)
+            PetResultCache.set(key, pet)
+            return pet
+
+        # Não encontrou: segue o caminho completo só para lançar o erro correto.
+        account = self.identity_map.get_or_load(
+            ('account', self.identify),
+            lambda: User.objects.get_user(self.identify)
+        )
+
+        user, ong = self.identity_map.get_or_load(
+            ('user_type', account.pk),
+            lambda: Pet.objects.get_user_type(account)
+        )
+
+        try:
+            pet = self.__get_pet(user, ong)
+        except CustomError:
+            PetResultCache.set(key, PetResultCache.NOT_FOUND, PetSettings.get('PETS_NOT_FOUND_CACHE_TIMEOUT'))
+            raise
+
+        PetResultCache.set(key, pet)
+
         return pet
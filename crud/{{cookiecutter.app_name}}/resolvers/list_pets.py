@@ -1,5 +1,13 @@
-from petguard.pets.models import Pet
-from django.db.models import Q
+from petguard.pets.models import Pet, PetAdoptionFeed
+from petguard.pets.planner import QueryPlanner
+from petguard.pets.pagination import KeysetPaginator, QuerysetCounter
+from petguard.pets.types import PetConnection
+from petguard.pets.lookups import IdentityLookup
+from petguard.pets.search import SearchBackend
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.identity import IdentityMap
+from petguard.pets.caching import PetResultCache
+from graphene.relay import PageInfo
 
 
 class ListPetResolver:
@@ -7,28 +15,32 @@ class ListPetResolver:
     Classe responsável pela lógica de listar pets
     """
 
-    def __init__(self, identify, kwargs):
+    def __init__(self, identify, kwargs, info=None):
         """
         Construtor
         """
 
+        self.info = info
         self.is_adoption = kwargs.get('is_adoption')
 
         if self.is_adoption:
-            self.query = Pet.objects.filter(Q(owner=None), ~Q(ong=None), is_adopted=False)
+            self.query = AdoptionFeed.get_queryset()
+            self.scopes = ['adoption']
         else:
-            self.query = Pet.objects.filter(
-                Q(owner__account__email=identify) |
-                Q(owner__account__username=identify) |
-                Q(ong__account__email=identify) |
-                Q(ong__account__username=identify)
-            )
+            ids = IdentityLookup.resolve(identify)
+            condition = IdentityLookup.get_filter(ids)
+            self.query = Pet.objects.filter(condition) if condition else Pet.objects.none()
+            self.scopes = [f"{relation}:{identifier}" for relation, identifier in ids.items() if identifier]
 
         self.search = kwargs.get('search')
         self.kind = kwargs.get('kind')
         self.is_adopted = kwargs.get('is_adopted')
         self.skip = kwargs.get('skip')
         self.first = kwargs.get('first')
+        self.after = kwargs.get('after')
+        self.paginator = KeysetPaginator(Pet)
+        self.search_backend = None
+        self.planner = None
 
     def __apply_search(self):
         """
@@ -36,12 +48,8 @@ class ListPetResolver:
         """
 
         if self.search:
-            self.query = self.query.filter(
-                Q(name__icontains=self.search) |
-                Q(ong__account__name=self.search) |
-                Q(ong__account__email=self.search) |
-                Q(ong__cnpj=self.search)
-            )
+            self.search_backend = SearchBackend.get_backend(self.query.db)
+            self.query = self.search_backend.search(self.query, self.search)
 
     def __apply_kind_filter(self):
         """
@@ -59,6 +67,77 @@ class ListPetResolver:
         if self.is_adopted is not None:
             self.query = self.query.filter(is_adopted=self.is_adopted)
 
+    def __is_feed_page(self):
+        """
+        Verifica se a página pode ser lida direto da tabela do feed de adoção.
+
+        Filtros nas colunas do pet (pesquisa, tipo, adotado) continuam na
+        consulta com join (ver AdoptionFeed.get_queryset).
+        """
+
+        return bool(
+            self.is_adoption and AdoptionFeed.is_enabled() and
+            not self.search and not self.kind and not self.is_adopted
+        )
+
+    def __apply_feed_page(self, limit=None):
+        """
+        Pega os ids da página na tabela do feed e busca somente esses pets.
+        """
+
+        identifies = AdoptionFeed.get_ids(self.after, self.skip, limit)
+        self.query = self.paginator.order(Pet.objects.filter(id__in=identifies))
+
+    def __apply_filters(self):
+        """
+        Aplica todos os filtros da listagem.
+        """
+
+        self.__apply_search()
+        self.__apply_kind_filter()
+        self.__apply_adopted()
+
+    def __apply_plan(self, path=(), fields=()):
+        """
+        Carrega somente as colunas e relações pedidas na consulta.
+        """
+
+        if self.info:
+            self.planner = QueryPlanner(
+                Pet, self.info,
+                field_map={'cursor': self.paginator.fields, 'photos': ('photo',)},
+                path=path,
+                fields=fields
+            )
+            self.query = self.planner.apply(self.query)
+
+    def __read(self, query):
+        """
+        Executa a consulta, usando a leitura leve do planner quando possível.
+        """
+
+        pets = self.planner.read(query) if self.planner else list(query)
+
+        return IdentityMap.from_info(self.info).merge(pets)
+
+    def __apply_cursor(self):
+        """
+        Aplica a ordenação do cursor e pega os dados após o cursor passado.
+        """
+
+        self.query = self.paginator.order(self.query)
+
+        if self.after:
+            self.query = self.paginator.after(self.query, self.after)
+
+    def __apply_rank(self):
+        """
+        Ordena pela relevância da pesquisa quando não está paginando por cursor.
+        """
+
+        if self.search and self.search_backend.ranked and not self.after:
+            self.query = self.query.order_by('-search_rank', *self.paginator.order_by)
+
     def __apply_skip(self):
         """
         Aplica o filtro de pular N primeiros dados.
@@ -75,15 +154,92 @@ class ListPetResolver:
         if self.first:
             self.query = self.query[:self.first]
 
+    def __get_cache_key(self):
+        """
+        Chave do resultado no cache, incluindo os campos pedidos na consulta.
+        """
+
+        if not self.scopes or PetResultCache.get_backend() is None:
+            return None
+
+        params = {
+            'search': self.search,
+            'kind': self.kind,
+            'is_adopted': self.is_adopted,
+            'is_adoption': self.is_adoption,
+            'skip': self.skip,
+            'first': self.first,
+            'after': self.after,
+            'selection': QueryPlanner(Pet, self.info).get_selection() if self.info else None
+        }
+
+        return PetResultCache.get_key(self.scopes, params)
+
     def get_result(self):
         """
         Resultado do resolver.
         """
 
-        self.__apply_search()
-        self.__apply_kind_filter()
-        self.__apply_adopted()
-        self.__apply_skip()
-        self.__apply_first()
+        key = self.__get_cache_key()
+        pets = PetResultCache.get(key)
+
+        if pets is not None:
+            return IdentityMap.from_info(self.info).merge(pets)
+
+        if self.__is_feed_page():
+            self.__apply_feed_page(self.first)
+            self.__apply_plan()
+        else:
+            self.__apply_filters()
+            self.__apply_plan()
+            self.__apply_cursor()
+            self.__apply_rank()
+            self.__apply_skip()
+            self.__apply_first()
+
+        pets = self.__read(self.query)
+        PetResultCache.set(key, pets)
+
+        return pets
+
+    def get_connection(self):
+        """
+        Resultado do resolver no formato de conexão (edges, page_info e total_count).
+        """
+
+        if self.__is_feed_page():
+            self.__apply_feed_page(self.first + 1 if self.first else None)
+            filtered = PetAdoptionFeed.objects.all()
+
+            self.__apply_plan(path=('edges', 'node'), fields=self.paginator.fields)
+            query = self.query
+        else:
+            self.__apply_filters()
+            filtered = self.query
+
+            self.__apply_plan(path=('edges', 'node'), fields=self.paginator.fields)
+            self.__apply_cursor()
+            self.__apply_skip()
+            query = self.query[:self.first + 1] if self.first else self.query
+
+        pets = self.__read(query)
+        has_next_page = bool(self.first) and len(pets) > self.first
+        pets = pets[:self.first] if self.first else pets
+
+        edges = [
+            PetConnection.Edge(node=pet, cursor=self.paginator.encode(pet))
+            for pet in pets
+        ]
+
+        connection = PetConnection(
+            edges=edges,
+            page_info=PageInfo(
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+                has_previous_page=bool(self.after or self.skip),
+                has_next_page=has_next_page
+            )
+        )
+        connection.counter = QuerysetCounter(filtered, self.scopes)
 
-        return self.query
+        return connection
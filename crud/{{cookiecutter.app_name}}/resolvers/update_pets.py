@@ -1,9 +1,11 @@
-from common.validations import GenericValidations
+from common.exceptions import CustomError
 from petguard.pets.models import Pet
-from petguard.pets.enum import (
-    PetTypeEnum, PetSexEnum, PetSizeEnum,
-    PetTemperamentEnum
-)
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.tracking import FieldTracker
+from petguard.pets.returning import UpdateReturning
+from petguard.pets.validators import PetValidators
+from petguard.pets.photos import PhotoPipeline
 
 
 class UpdatePetsResolver:
@@ -11,17 +13,40 @@ class UpdatePetsResolver:
     Classe responsável pela lógica de atualização de pets
     """
 
-    def __init__(self, user, identify, data):
+    # Campos simples que podem ser alterados direto com UPDATE ... RETURNING.
+    scalar_fields = (
+        'name', 'kind', 'sex', 'height', 'temperament',
+        'breed', 'age', 'phone', 'weight', 'description'
+    )
+
+    def __init__(self, user, identify, data, pet=None):
         """
         Construtor
+
+        O pet pode ser passado já carregado (e com a posse já verificada),
+        como na atualização em lote. Alterações somente de campos simples não
+        carregam o pet (ver __update_returning).
         """
 
-        self.user, ong = Pet.objects.get_user_type(user)
+        self.identify = identify
+        self.data = data
+        self.pet = pet
+
+        if pet is None:
+            self.user, self.ong = Pet.objects.get_user_type(user)
 
-        if ong:
-            self.pet = Pet.objects.get_pet_ong(identify, self.user)
-        else:
-            self.pet = Pet.objects.get_pet(identify, self.user)
+            if self.__is_scalar_update():
+                return
+
+            if self.ong:
+                self.pet = Pet.objects.get_pet_ong(identify, self.user)
+            else:
+                self.pet = Pet.objects.get_pet(identify, self.user)
+
+        # As relações não usam o DirtyFieldsMixin, então o snapshot é feito aqui.
+        for related in (self.pet.alimentation, self.pet.special_cares):
+            if related is not None:
+                FieldTracker.snapshot(related)
 
         self.pet.name = data.get('name', self.pet.name)
         self.pet.kind = data.get('kind', self.pet.kind)
@@ -37,6 +62,19 @@ class UpdatePetsResolver:
         self.__get_alimentation_attributes(data)
         self.__get_special_cares_attributes(data)
 
+    def __is_scalar_update(self):
+        """
+        Verifica se a atualização altera somente campos simples do pet.
+
+        Foto, alimentação e cuidados especiais continuam no caminho que carrega o pet.
+        """
+
+        return (
+            bool(self.data) and
+            all(name in self.scalar_fields for name in self.data) and
+            UpdateReturning.is_supported(Pet)
+        )
+
     def __get_alimentation_attributes(self, data):
         """
         Pega os atributos relacionados a alimentação do pet.
@@ -138,36 +176,53 @@ class UpdatePetsResolver:
                 self.pet.special_cares.observations if self.pet.special_cares else ''
             )
 
-    def __validations(self):
+    def __update_returning(self):
         """
-        Valida alguns dados de entrada.
+        Altera o pet com um único UPDATE ... RETURNING, verificando a posse no WHERE.
         """
 
-        GenericValidations.validate_required_field("name", self.pet.name)
-        GenericValidations.validate_required_field("kind", self.pet.kind)
-        GenericValidations.belongs_to_enum(PetTypeEnum, self.pet.kind)
-        GenericValidations.validate_required_field("sex", self.pet.sex)
-        GenericValidations.belongs_to_enum(PetSexEnum, self.pet.sex)
-        GenericValidations.validate_required_field("height", self.pet.height)
-        GenericValidations.belongs_to_enum(PetSizeEnum, self.pet.height)
-        GenericValidations.validate_required_field("temperament", self.pet.temperament)
-        GenericValidations.belongs_to_enum(PetTemperamentEnum, self.pet.temperament)
-
-        if self.pet.alimentation:
-            GenericValidations.validate_required_field("qtd", self.pet.alimentation.qtd)
-            GenericValidations.belongs_to_enum(PetSizeEnum, self.pet.alimentation.qtd)
-            GenericValidations.validate_required_field("food", self.pet.alimentation.food)
-            GenericValidations.validate_required_field("frequency", self.pet.alimentation.frequency)
+        changes = {name: self.data.get(name) for name in self.scalar_fields if name in self.data}
+
+        PetValidators.pet.validate(changes, partial=True)
+
+        owner = 'ong' if self.ong else 'owner'
+        queryset = Pet.objects.filter(id=self.identify, **{owner: self.user})
+
+        self.pet = UpdateReturning.update(queryset, changes)
+
+        if self.pet is None:
+            raise CustomError(
+                message="Não foi encontrado o pet com o identificador passado.",
+                cause=f"ID: {self.identify}"
+            )
+
+        AdoptionFeed.sync(self.pet)
+        PetResultCache.invalidate(self.pet)
+
+        return self.pet
 
     def get_result(self):
         """
         Resultado do resolver.
         """
 
-        self.__validations()
+        if self.pet is None:
+            return self.__update_returning()
+
+        PetValidators.pet.validate(self.pet)
+        staged = PhotoPipeline.stage(self.pet)
+
+        # Salva somente as colunas alteradas, pulando as linhas sem mudanças.
+        changed = [
+            FieldTracker.save(obj)
+            for obj in (self.pet.alimentation, self.pet.special_cares, self.pet)
+            if obj is not None
+        ]
+
+        PhotoPipeline.schedule(*staged)
 
-        self.pet.alimentation.save()
-        self.pet.special_cares.save()
-        self.pet.save()
+        if any(changed):
+            AdoptionFeed.sync(self.pet)
+            PetResultCache.invalidate(self.pet)
 
         return self.pet
@@ -0,0 +1,188 @@
+from django.db import connections, models, router
+from django.utils import timezone
+import datetime
+
+
+class UpdateReturning:
+    """
+    UPDATE ... RETURNING: altera e lê a linha atualizada em um único comando.
+    """
+
+    @staticmethod
+    def is_supported(model):
+        """
+        Verifica se o banco da modelo aceita RETURNING no UPDATE (PostgreSQL e SQLite 3.35+).
+        """
+
+        connection = connections[router.db_for_write(model)]
+
+        if connection.vendor == 'postgresql':
+            return True
+
+        if connection.vendor == 'sqlite':
+            return connection.Database.sqlite_version_info >= (3, 35, 0)
+
+        return False
+
+    @staticmethod
+    def __get_auto_now(model, changes):
+        """
+        Valores das colunas com auto_now, que o UPDATE direto não preenche sozinho.
+        """
+
+        values = {}
+
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) and field.name not in changes:
+                if isinstance(field, models.DateTimeField):
+                    values[field.name] = timezone.now()
+                else:
+                    values[field.name] = datetime.date.today()
+
+        return values
+
+    @classmethod
+    def update(cls, queryset, changes):
+        """
+        Aplica as alterações na linha filtrada pelo queryset e retorna o objeto atualizado.
+
+        O WHERE é o do próprio queryset (incluindo o filtro do gerenciador),
+        então a posse pode ser verificada no mesmo comando. Retorna None se
+        nenhuma linha for encontrada. O queryset não pode ter joins.
+        """
+
+        model = queryset.model
+        meta = model._meta
+        using = queryset.db
+        connection = connections[using]
+        quote = connection.ops.quote_name
+
+        assignments, params = [], []
+
+        for name, value in {**changes, **cls.__get_auto_now(model, changes)}.items():
+            field = meta.get_field(name)
+            assignments.append(f"{quote(field.column)} = %s")
+            params.append(field.get_db_prep_save(value, connection))
+
+        compiler = queryset.query.get_compiler(using)
+        where, where_params = compiler.compile(queryset.query.where)
+
+        # Sem filtro o UPDATE alteraria a tabela inteira.
+        if not where:
+            raise ValueError("O queryset do UPDATE ... RETURNING precisa de filtro.")
+
+        fields = list(meta.concrete_fields)
+        columns = [field.get_col(meta.db_table) for field in fields]
+
+        sql = (
+            f"UPDATE {quote(meta.db_table)} SET {', '.join(assignments)} "
+            f"WHERE {where} "
+            f"RETURNING {', '.join(quote(field.column) for field in fields)}"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + list(where_params))
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        values = []
+
+        for column, value in zip(columns, row):
+            converters = connection.ops.get_db_converters(column) + column.get_db_converters(connection)
+
+            for converter in converters:
+                value = converter(value, column, connection)
+
+            values.append(value)
+
+        return model.from_db(using, [field.attname for field in fields], values)
+
+
+class InsertReturning:
+    """
+    INSERT de um objeto e das suas relações um-para-um em um único comando (CTE).
+    """
+
+    @staticmethod
+    def is_supported(model):
+        """
+        Verifica se o banco da modelo aceita INSERT dentro de CTE (somente PostgreSQL).
+        """
+
+        return connections[router.db_for_write(model)].vendor == 'postgresql'
+
+    @staticmethod
+    def __get_insert(obj, connection, exclude=()):
+        """
+        Colunas e valores do INSERT do objeto, aplicando o pre_save (auto_now_add, arquivos).
+        """
+
+        meta = obj._meta
+        fields = [
+            field for field in meta.local_concrete_fields
+            if field is not meta.auto_field and field.name not in exclude
+        ]
+
+        columns = [connection.ops.quote_name(field.column) for field in fields]
+        params = [field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields]
+
+        return columns, params
+
+    @classmethod
+    def insert(cls, obj, related):
+        """
+        Insere o objeto e as relações de related ({nome do campo: objeto ou None}).
+
+        As relações são inseridas em CTEs (WITH ... INSERT ... RETURNING) e o
+        objeto principal usa os ids retornados, tudo no mesmo comando. Os sinais
+        de save da modelo não são enviados.
+        """
+
+        related = {name: value for name, value in related.items() if value is not None}
+        meta = obj._meta
+        using = router.db_for_write(type(obj))
+        connection = connections[using]
+        quote = connection.ops.quote_name
+
+        ctes, params, placeholders = [], [], []
+
+        for index, (name, value) in enumerate(related.items()):
+            field = meta.get_field(name)
+            columns, values = cls.__get_insert(value, connection)
+
+            ctes.append(
+                f"r{index} AS (INSERT INTO {quote(value._meta.db_table)} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(values))}) "
+                f"RETURNING {quote(field.target_field.column)})"
+            )
+            params.extend(values)
+            placeholders.append((quote(field.column), f"(SELECT {quote(field.target_field.column)} FROM r{index})"))
+
+        columns, values = cls.__get_insert(obj, connection, exclude=related)
+        returning = [meta.pk] + [meta.get_field(name) for name in related]
+
+        sql = (
+            (f"WITH {', '.join(ctes)} " if ctes else "") +
+            f"INSERT INTO {quote(meta.db_table)} "
+            f"({', '.join(columns + [column for column, _ in placeholders])}) "
+            f"VALUES ({', '.join(['%s'] * len(values) + [select for _, select in placeholders])}) "
+            f"RETURNING {', '.join(quote(field.column) for field in returning)}"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + values)
+            row = cursor.fetchone()
+
+        setattr(obj, meta.pk.attname, row[0])
+
+        for (name, value), identify in zip(related.items(), row[1:]):
+            setattr(value, meta.get_field(name).target_field.attname, identify)
+            setattr(obj, name, value)
+
+        for instance in [obj, *related.values()]:
+            instance._state.adding = False
+            instance._state.db = using
+
+        return obj
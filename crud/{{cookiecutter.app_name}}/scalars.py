@@ -0,0 +1,83 @@
+from graphene.types import Scalar
+from graphql.language import ast
+from common.exceptions import CustomError
+from .enum import PetTypeEnum, PetSexEnum, PetSizeEnum, PetTemperamentEnum
+
+
+class EnumField(Scalar):
+    """
+    Valor de um enum do enum.py validado na leitura da requisição, antes do resolver.
+
+    Aceita o valor como string ("DOG") ou como literal de enum (DOG). Valores
+    vazios passam para o validador do resolver, que informa o campo obrigatório.
+    """
+
+    values = frozenset()
+
+    @classmethod
+    def parse_value(cls, value):
+        """
+        Valida o valor vindo das variáveis da requisição.
+        """
+
+        if value in (None, ''):
+            return value
+
+        if value not in cls.values:
+            raise CustomError(
+                message="O valor passado não consta nos valores definidos no sistema.",
+                cause=f"Valor passado: {value}"
+            )
+
+        return value
+
+    @classmethod
+    def parse_literal(cls, node):
+        """
+        Valida o valor escrito direto na consulta.
+        """
+
+        if isinstance(node, (ast.StringValue, ast.EnumValue)):
+            return cls.parse_value(node.value)
+
+        return None
+
+    @staticmethod
+    def serialize(value):
+        """
+        Valor enviado na resposta.
+        """
+
+        return getattr(value, 'value', value)
+
+
+class PetTypeField(EnumField):
+    """
+    Tipo do animal de estimação (CAT, DOG).
+    """
+
+    values = frozenset(tag.value for tag in PetTypeEnum)
+
+
+class PetSexField(EnumField):
+    """
+    Sexo do animal de estimação (FEMALE, MALE).
+    """
+
+    values = frozenset(tag.value for tag in PetSexEnum)
+
+
+class PetSizeField(EnumField):
+    """
+    Porte do animal de estimação ou quantidade de ração (SMALL, MEDIUM, BIG).
+    """
+
+    values = frozenset(tag.value for tag in PetSizeEnum)
+
+
+class PetTemperamentField(EnumField):
+    """
+    Temperamento do animal de estimação (DOCILE, FRIENDLY, BRAVE).
+    """
+
+    values = frozenset(tag.value for tag in PetTemperamentEnum)
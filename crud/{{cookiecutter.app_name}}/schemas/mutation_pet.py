@@ -1,4 +1,7 @@
-from petguard.pets.mutations import CreatePetMutation, UpdatePetMutation, DeletePetMutation
+from petguard.pets.mutations import (
+    CreatePetMutation, CreatePetsMutation, UpdatePetMutation,
+    UpdatePetsMutation, DeletePetMutation, DeletePetsMutation
+)
 import graphene
 
 
@@ -8,5 +11,8 @@ class MutationPet(graphene.ObjectType):
     """
 
     create_pet = CreatePetMutation.Field()
+    create_pets = CreatePetsMutation.Field()
     update_pet = UpdatePetMutation.Field()
+    update_pets = UpdatePetsMutation.Field()
     delete_pet = DeletePetMutation.Field()
+    delete_pets = DeletePetsMutation.Field()
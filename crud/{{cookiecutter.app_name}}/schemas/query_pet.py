@@ -1,4 +1,4 @@
-from petguard.pets.types import PetType
+from petguard.pets.types import PetType, PetConnection
 from petguard.pets.resolvers import ListPetResolver, FetchPetResolver
 from graphene.types import String, Int, Boolean
 import graphene
@@ -13,12 +13,26 @@ class QueryPet(graphene.ObjectType):
         PetType,
         description="Listar todos os pets de um usuário do pet guard.",
         identify=String(required=True, description="Identificador do usuário."),
-        search=String(description="Procurar um pet pelo seu nome ou pelos dados da ong na qual ele pertence (nome, email ou cnpj)."),
+        search=String(description="Procurar um pet pelo seu nome ou pelos dados da ong na qual ele pertence (nome, email ou cnpj). Sem cursor os pets são ordenados pela relevância."),
         kind=String(description="Filtrar os pets do tipo DOG ou CAT."),
         is_adoption=Boolean(description="Filtra somente os pets que estão em adoção."),
         is_adopted=Boolean(description="Filtra por pets adotados."),
         skip=Int(description="Pula os primeiros N usuários."),
-        first=Int(description="Pega os primeiros N usuários após o skip.")
+        first=Int(description="Pega os primeiros N usuários após o skip."),
+        after=String(description="Pega os pets após o cursor passado (campo cursor do pet).")
+    )
+
+    connection = graphene.Field(
+        PetConnection,
+        description="Listar os pets de um usuário do pet guard com paginação e total de pets.",
+        identify=String(required=True, description="Identificador do usuário."),
+        search=String(description="Procurar um pet pelo seu nome ou pelos dados da ong na qual ele pertence (nome, email ou cnpj)."),
+        kind=String(description="Filtrar os pets do tipo DOG ou CAT."),
+        is_adoption=Boolean(description="Filtra somente os pets que estão em adoção."),
+        is_adopted=Boolean(description="Filtra por pets adotados."),
+        skip=Int(description="Pula os primeiros N pets."),
+        first=Int(description="Pega os primeiros N pets após o skip ou cursor."),
+        after=String(description="Pega os pets após o cursor passado (end_cursor da página anterior).")
     )
 
     instance = graphene.Field(
@@ -33,15 +47,24 @@ class QueryPet(graphene.ObjectType):
         Cada campo é manipulado por meio de resolvers, que retornam um valor.
         """
 
-        pets = ListPetResolver(identify, kwargs).get_result()
+        pets = ListPetResolver(identify, kwargs, info).get_result()
 
         return pets
 
+    def resolve_connection(self, info, identify, **kwargs):
+        """
+        Lista os pets no formato de conexão.
+        """
+
+        connection = ListPetResolver(identify, kwargs, info).get_connection()
+
+        return connection
+
     def resolve_instance(self, info, identify, pet_id):
         """
         Pega um usuário especifico
         """
 
-        pet = FetchPetResolver(identify, pet_id).get_result()
+        pet = FetchPetResolver(identify, pet_id, info).get_result()
 
         return pet
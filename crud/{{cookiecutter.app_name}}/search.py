@@ -0,0 +1,296 @@
+from django.db import connections
+from django.db.models import F, Lookup, Q, FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from .conf import PetSettings
+from .models import Pet
+import sqlite3
+
+
+class ILike(Lookup):
+    """
+    ILIKE '%texto%' do PostgreSQL, predicado que o índice GIN do pg_trgm atende.
+
+    O icontains do Django vira UPPER(coluna) LIKE UPPER(%s), que não usa o
+    índice criado na coluna.
+    """
+
+    lookup_name = 'ilike'
+
+    def get_prep_lookup(self):
+        """
+        Escapa os curingas do texto e procura por qualquer parte da coluna.
+        """
+
+        value = str(self.rhs).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+        return f"%{value}%"
+
+    def as_sql(self, compiler, connection):
+        """
+        SQL do lookup.
+        """
+
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+class SearchBackend:
+    """
+    Busca padrão por parte do nome do pet (icontains), sem índice de busca.
+    """
+
+    field = '{{cookiecutter.model.string_attr}}'
+    ranked = False
+    vendor = None
+
+    @staticmethod
+    def get_backend(using='default'):
+        """
+        Pega o backend configurado em PETS_SEARCH_BACKEND ou o melhor para o banco.
+        """
+
+        path = PetSettings.get('PETS_SEARCH_BACKEND')
+
+        if path:
+            return import_string(path)()
+
+        vendor = connections[using].vendor
+
+        if vendor == 'postgresql':
+            return PostgresSearchBackend()
+
+        if vendor == 'sqlite' and SQLiteSearchBackend.is_available(using):
+            return SQLiteSearchBackend()
+
+        return SearchBackend()
+
+    @classmethod
+    def install(cls, connection):
+        """
+        Cria no banco o índice usado pelo backend, quando ele precisa de um.
+        """
+
+    def get_ong_condition(self, search):
+        """
+        Pets da ong com o nome, email ou cnpj passado.
+        """
+
+        partners = Pet._meta.get_field('ong').related_model.objects.filter(
+            Q(account__name=search) |
+            Q(account__email=search) |
+            Q(cnpj=search)
+        ).values('id')
+
+        return Q(ong_id__in=partners)
+
+    def get_name_condition(self, search):
+        """
+        Pets com parte do nome igual ao texto passado.
+        """
+
+        return Q(**{f"{self.field}__icontains": search})
+
+    def search(self, queryset, search):
+        """
+        Aplica a pesquisa no queryset.
+        """
+
+        return queryset.filter(self.get_name_condition(search) | self.get_ong_condition(search))
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Busca no PostgreSQL usando o índice GIN do pg_trgm, ordenada pela similaridade.
+    """
+
+    ranked = True
+    vendor = 'postgresql'
+
+    @classmethod
+    def install(cls, connection):
+        """
+        Cria a extensão pg_trgm e o índice GIN do campo, se ainda não existirem.
+        """
+
+        table = Pet._meta.db_table
+        column = Pet._meta.get_field(cls.field).column
+
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{cls.field}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+
+    def get_name_condition(self, search):
+        """
+        Pets com parte do nome igual ao texto passado, usando o índice GIN.
+        """
+
+        return Q(ILike(F(self.field), search))
+
+    def search(self, queryset, search):
+        """
+        Aplica a pesquisa e anota a relevância de cada pet em search_rank.
+        """
+
+        # Importado aqui para não exigir o driver do PostgreSQL em outros bancos.
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return super().search(queryset, search).annotate(
+            search_rank=TrigramSimilarity(self.field, search)
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Busca no SQLite usando a tabela FTS5 (tokenizer trigram) criada depois do migrate.
+    """
+
+    ranked = True
+    vendor = 'sqlite'
+    table = f"{Pet._meta.db_table}_fts"
+    min_length = 3
+
+    # Resultado da verificação da tabela FTS5 por banco (alias), feita uma vez por processo.
+    available = {}
+
+    @classmethod
+    def is_available(cls, using='default'):
+        """
+        Verifica se a tabela FTS5 existe no banco.
+        """
+
+        if using not in cls.available:
+            with connections[using].cursor() as cursor:
+                cls.available[using] = cls.table in connections[using].introspection.table_names(cursor)
+
+        return cls.available[using]
+
+    @staticmethod
+    def is_supported(connection):
+        """
+        Verifica se o SQLite tem o FTS5 com o tokenizer trigram (3.34+).
+        """
+
+        if sqlite3.sqlite_version_info < (3, 34):
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA compile_options")
+            options = [row[0] for row in cursor.fetchall()]
+
+        return 'ENABLE_FTS5' in options
+
+    @classmethod
+    def install(cls, connection):
+        """
+        Cria a tabela FTS5 e os triggers que a mantêm igual à tabela de pets.
+
+        Recriar a tabela de pets (como o SQLite faz em alguns AlterField) apaga
+        os triggers. Quando falta algum, eles são recriados e o índice é
+        reconstruído.
+        """
+
+        if not cls.is_supported(connection):
+            return
+
+        table = Pet._meta.db_table
+        column = Pet._meta.get_field(cls.field).column
+        triggers = {f"{cls.table}_{name}" for name in ('insert', 'delete', 'update')}
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [table])
+
+            if triggers <= {row[0] for row in cursor.fetchall()}:
+                return
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {cls.table} USING fts5("
+                f"{column}, content='{table}', content_rowid='id', tokenize='trigram')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {cls.table}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {cls.table}(rowid, {column}) VALUES (new.id, new.{column}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {cls.table}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {cls.table}({cls.table}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {cls.table}_update AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {cls.table}({cls.table}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+                f"INSERT INTO {cls.table}(rowid, {column}) VALUES (new.id, new.{column}); END"
+            )
+            cursor.execute(f"INSERT INTO {cls.table}({cls.table}) VALUES ('rebuild')")
+
+        cls.available.pop(connection.alias, None)
+
+    @staticmethod
+    def __quote(search):
+        """
+        Transforma o texto em uma frase do FTS5, evitando a sintaxe de consulta.
+        """
+
+        return '"' + search.replace('"', '""') + '"'
+
+    def get_name_condition(self, search):
+        """
+        Pets com parte do nome igual ao texto passado, usando o índice FTS5.
+        """
+
+        # O tokenizer trigram só encontra textos com pelo menos 3 caracteres.
+        if len(search) < self.min_length:
+            return super().get_name_condition(search)
+
+        return Q(id__in=RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s",
+            [self.__quote(search)]
+        ))
+
+    def search(self, queryset, search):
+        """
+        Aplica a pesquisa e anota a relevância (bm25) de cada pet em search_rank.
+        """
+
+        if len(search) < self.min_length:
+            rank = Value(0.0, output_field=FloatField())
+        else:
+            rank = Coalesce(RawSQL(
+                f"SELECT -bm25({self.table}) FROM {self.table} "
+                f"WHERE {self.table} MATCH %s AND {self.table}.rowid = {Pet._meta.db_table}.id",
+                [self.__quote(search)],
+                output_field=FloatField()
+            ), Value(0.0))
+
+        return super().search(queryset, search).annotate(search_rank=rank)
+
+
+@receiver(post_migrate, dispatch_uid='install_pets_search_index')
+def install_search_index(sender, using='default', **kwargs):
+    """
+    Cria os índices de busca do banco depois do migrate do app.
+
+    Os índices dependem do banco e não fazem parte do estado da modelo, então
+    não saem do makemigrations. A criação é idempotente e também devolve os
+    triggers do FTS5 depois de o SQLite recriar a tabela de pets.
+    """
+
+    if sender.label != Pet._meta.app_label:
+        return
+
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        if Pet._meta.db_table not in connection.introspection.table_names(cursor):
+            return
+
+    for backend in (PostgresSearchBackend, SQLiteSearchBackend):
+        if backend.vendor == connection.vendor:
+            backend.install(connection)
@@ -0,0 +1,355 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from common.test_utils import GenericTestUtils
+from petguard.users.models import PetGuardUser, PetGuardPartner
+from petguard.users.models.petguard_user import insert_qrcode_to_account
+from petguard.pets.models import Pet, Alimentation, SpecialCares, PetAdoptionFeed
+
+User = get_user_model()
+
+
+class BulkCreatePetsTestCase(TestCase):
+    """
+    Teste para cadastrar vários pets de uma vez no sistema
+    """
+
+    def setUp(self):
+        """
+        Método que roda a cada teste
+        """
+
+        post_save.disconnect(insert_qrcode_to_account, sender=PetGuardUser, dispatch_uid='insert_qrcode_to_account')
+
+        user1 = User.objects.create_user(
+            username='fulano',
+            name='Fulano',
+            email='fulano@gmail.com',
+            password='django1234'
+        )
+
+        self.petguard_user = PetGuardUser.objects.create(account=user1)
+
+        user2 = User.objects.create_user(
+            username='ong',
+            name='Ong',
+            email='ong@gmail.com',
+            password='django1234'
+        )
+
+        self.petguard_partner = PetGuardPartner.objects.create(account=user2)
+
+        self.query = """
+            mutation CreatePets($data: [CreatePetInput!]!, $partial: Boolean) {
+                petguard {
+                    pets {
+                        create_pets(data: $data, partial: $partial) {
+                            pets {
+                                name
+                                alimentation {
+                                    food
+                                }
+                                special_cares {
+                                    bathing_frequency
+                                }
+                            }
+                            errors {
+                                index
+                                message
+                                cause
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        self.variables = {
+            'data': [
+                {
+                    'name': "XU",
+                    'kind': "DOG",
+                    'sex': "FEMALE",
+                    'height': "SMALL",
+                    'temperament': "FRIENDLY",
+                    'alimentation': {
+                        'qtd': "SMALL",
+                        'food': "pedigree",
+                        'frequency': 2
+                    },
+                    'special_cares': {
+                        'veterinary_frequency': 2,
+                        'bathing_frequency': 1
+                    }
+                },
+                {
+                    'name': "REX",
+                    'kind': "DOG",
+                    'sex': "MALE",
+                    'height': "BIG",
+                    'temperament': "BRAVE"
+                },
+                {
+                    'name': "MIAU",
+                    'kind': "CAT",
+                    'sex': "MALE",
+                    'height': "SMALL",
+                    'temperament': "DOCILE",
+                    'alimentation': {
+                        'qtd': "SMALL",
+                        'food': "whiskas",
+                        'frequency': 3
+                    }
+                }
+            ]
+        }
+
+        self.request = GenericTestUtils.authenticate(self.petguard_user.account)
+
+        self.maxDiff = None
+
+    def tearDown(self):
+        """
+        This method will run after any test.
+        """
+
+        SpecialCares.objects.all().delete()
+        Alimentation.objects.all().delete()
+        Pet.objects.all().delete()
+        PetGuardPartner.objects.all().delete()
+        PetGuardUser.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_create_pets(self):
+        """
+        Criando vários pets com um INSERT por tabela.
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pets": {
+                            "pets": [
+                                {
+                                    'name': "XU",
+                                    'alimentation': {'food': "pedigree"},
+                                    'special_cares': {'bathing_frequency': 1}
+                                },
+                                {
+                                    'name': "REX",
+                                    'alimentation': None,
+                                    'special_cares': None
+                                },
+                                {
+                                    'name': "MIAU",
+                                    'alimentation': {'food': "whiskas"},
+                                    'special_cares': None
+                                }
+                            ],
+                            "errors": []
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 3)
+        self.assertEqual(Alimentation.objects.count(), 2)
+        self.assertEqual(SpecialCares.objects.count(), 1)
+        self.assertEqual(Pet.objects.filter(owner=self.petguard_user).count(), 3)
+        self.assertEqual(Pet.objects.get(name="MIAU").alimentation.food, "whiskas")
+
+    def test_invalid_item_cancel_all(self):
+        """
+        Sem o modo parcial um item inválido cancela o lote inteiro.
+        """
+
+        self.variables['data'][1]['kind'] = 'HORSE'
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "O valor passado não consta nos valores definidos no sistema.",
+                "cause": "Valor passado: HORSE"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 0)
+        self.assertEqual(Alimentation.objects.count(), 0)
+        self.assertEqual(SpecialCares.objects.count(), 0)
+
+    def test_partial_create_pets(self):
+        """
+        No modo parcial os itens válidos são criados e os inválidos retornam o erro.
+        """
+
+        self.variables['data'][1]['name'] = ''
+        self.variables['partial'] = True
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pets": {
+                            "pets": [
+                                {
+                                    'name': "XU",
+                                    'alimentation': {'food': "pedigree"},
+                                    'special_cares': {'bathing_frequency': 1}
+                                },
+                                {
+                                    'name': "MIAU",
+                                    'alimentation': {'food': "whiskas"},
+                                    'special_cares': None
+                                }
+                            ],
+                            "errors": [
+                                {
+                                    'index': 1,
+                                    'message': "Campo name não pode ser vazio.",
+                                    'cause': "Valor passado está vazio."
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 2)
+        self.assertFalse(Pet.objects.filter(kind="DOG", sex="MALE").exists())
+
+    @override_settings(PETS_BULK_MAX_SIZE=2)
+    def test_limit_create_pets(self):
+        """
+        Não é possível criar mais pets que o limite configurado.
+        """
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "A quantidade de pets passada é maior que o limite permitido.",
+                "cause": "Limite: 2"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 0)
+
+    @override_settings(PETS_ADOPTION_FEED=True)
+    def test_create_pets_partner_adoption_feed(self):
+        """
+        Os pets criados em lote pela ong entram no feed de adoção.
+        """
+
+        request = GenericTestUtils.authenticate(self.petguard_partner.account)
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data={
+                "status": 200,
+                "data": {
+                    "petguard": {
+                        "pets": {
+                            "create_pets": {
+                                "pets": [
+                                    {'name': "XU", 'alimentation': {'food': "pedigree"}, 'special_cares': {'bathing_frequency': 1}},
+                                    {'name': "REX", 'alimentation': None, 'special_cares': None},
+                                    {'name': "MIAU", 'alimentation': {'food': "whiskas"}, 'special_cares': None}
+                                ],
+                                "errors": []
+                            }
+                        }
+                    }
+                }
+            },
+            variables=self.variables,
+            context=request
+        )
+
+        self.assertEqual(PetAdoptionFeed.objects.count(), 3)
+
+    def test_create_pets_idempotency_key(self):
+        """
+        Repetir o lote com a mesma chave retorna os pets já criados, na mesma ordem.
+        """
+
+        query = """
+            mutation CreatePets($data: [CreatePetInput!]!, $key: String) {
+                petguard {
+                    pets {
+                        create_pets(data: $data, idempotency_key: $key) {
+                            pets {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pets": {
+                            "pets": [
+                                {'name': "XU"},
+                                {'name': "REX"},
+                                {'name': "MIAU"}
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+
+        self.variables['key'] = "9b1d7e40-retry"
+
+        for _ in range(2):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data=result,
+                variables=self.variables,
+                context=self.request
+            )
+
+        self.assertEqual(Pet.objects.count(), 3)
+        self.assertEqual(Alimentation.objects.count(), 2)
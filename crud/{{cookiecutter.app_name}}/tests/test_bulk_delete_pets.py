@@ -0,0 +1,246 @@
+from unittest import skipIf
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from common.test_utils import GenericTestUtils
+from petguard.users.models import PetGuardUser, PetGuardPartner
+from petguard.users.models.petguard_user import insert_qrcode_to_account
+from petguard.pets.models import Pet, Alimentation, SpecialCares, PetAdoptionFeed
+from petguard.pets.feed import AdoptionFeed
+from petguard.pets.purge import PetPurge
+
+User = get_user_model()
+
+
+class BulkDeletePetsTestCase(TestCase):
+    """
+    Teste para deletar vários pets de uma vez no sistema
+    """
+
+    def setUp(self):
+        """
+        Método que roda a cada teste
+        """
+
+        post_save.disconnect(insert_qrcode_to_account, sender=PetGuardUser, dispatch_uid='insert_qrcode_to_account')
+
+        user1 = User.objects.create_user(
+            username='fulano1',
+            name='Fulano1',
+            email='fulano1@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user1 = PetGuardUser.objects.create(account=user1)
+
+        user2 = User.objects.create_user(
+            username='fulano2',
+            name='Fulano2',
+            email='fulano2@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user2 = PetGuardUser.objects.create(account=user2)
+
+        partner = User.objects.create_user(
+            username='ong',
+            name='Ong',
+            email='ong@gmail.com',
+            password='django1234'
+        )
+        self.petguard_partner = PetGuardPartner.objects.create(account=partner)
+
+        self.pets = []
+
+        for owner, ong in [
+            (self.petguard_user1, None),
+            (self.petguard_user1, None),
+            (self.petguard_user2, None),
+            (None, self.petguard_partner)
+        ]:
+            self.pets.append(Pet.objects.create(
+                owner=owner,
+                ong=ong,
+                name="XU",
+                kind="DOG",
+                sex="FEMALE",
+                height="SMALL",
+                temperament="FRIENDLY",
+                alimentation=Alimentation.objects.create(qtd="SMALL", food="pedigree", frequency=2),
+                special_cares=SpecialCares.objects.create(veterinary_frequency=2, bathing_frequency=1)
+            ))
+
+        self.query = """
+            mutation DeletePets($identifies: [Int!]!) {
+                petguard {
+                    pets {
+                        delete_pets(identifies: $identifies) {
+                            removed
+                            not_found
+                        }
+                    }
+                }
+            }
+        """
+
+        self.request = GenericTestUtils.authenticate(self.petguard_user1.account)
+
+        self.maxDiff = None
+
+    def tearDown(self):
+        """
+        This method will run after any test.
+        """
+
+        PetAdoptionFeed.objects.all().delete()
+        Pet.objects.all().delete()
+        SpecialCares.objects.all().delete()
+        Alimentation.objects.all().delete()
+        PetGuardPartner.objects.all().delete()
+        PetGuardUser.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_delete_pets(self):
+        """
+        Deleta os pets do usuário com um DELETE por tabela e informa os não encontrados.
+        """
+
+        variables = {'identifies': [self.pets[0].id, self.pets[1].id, self.pets[2].id, 0]}
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "delete_pets": {
+                            "removed": 2,
+                            "not_found": [self.pets[2].id, 0]
+                        }
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=variables,
+                context=self.request
+            )
+
+        deletes = [query['sql'] for query in context.captured_queries if query['sql'].startswith('DELETE')]
+
+        self.assertEqual(len(deletes), 4)
+        self.assertEqual(Pet.objects.count(), 2)
+        self.assertEqual(Alimentation.objects.count(), 2)
+        self.assertEqual(SpecialCares.objects.count(), 2)
+        self.assertTrue(Pet.objects.filter(id=self.pets[2].id).exists())
+
+    def test_delete_pets_not_owner(self):
+        """
+        Nenhum pet de outro usuário é removido.
+        """
+
+        variables = {'identifies': [self.pets[2].id, self.pets[3].id]}
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "delete_pets": {
+                            "removed": 0,
+                            "not_found": [self.pets[2].id, self.pets[3].id]
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 4)
+
+    @override_settings(PETS_ADOPTION_FEED=True)
+    def test_delete_pets_ong_adoption_feed(self):
+        """
+        Os pets da ong removidos também saem do feed de adoção.
+        """
+
+        AdoptionFeed.sync(self.pets[3])
+
+        request = GenericTestUtils.authenticate(self.petguard_partner.account)
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "delete_pets": {
+                            "removed": 1,
+                            "not_found": []
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables={'identifies': [self.pets[3].id]},
+            context=request
+        )
+
+        self.assertEqual(Pet.objects.count(), 3)
+        self.assertEqual(PetAdoptionFeed.objects.count(), 0)
+
+    @skipIf(PetPurge.is_soft_delete(), "No soft delete as fotos são apagadas pelo purge.")
+    def test_delete_pets_photos(self):
+        """
+        As fotos dos pets removidos são apagadas do storage depois do commit.
+        """
+
+        pet = self.pets[0]
+        pet.photo = SimpleUploadedFile("pet.png", GenericTestUtils.create_image(None, 'pet.png').getvalue())
+        pet.save()
+
+        storage = pet.photo.storage
+        name = pet.photo.name
+
+        self.assertTrue(storage.exists(name))
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "delete_pets": {
+                            "removed": 1,
+                            "not_found": []
+                        }
+                    }
+                }
+            }
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables={'identifies': [pet.id]},
+                context=self.request
+            )
+
+        self.assertFalse(storage.exists(name))
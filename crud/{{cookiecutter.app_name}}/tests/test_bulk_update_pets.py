@@ -0,0 +1,226 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from common.test_utils import GenericTestUtils
+from petguard.users.models import PetGuardUser
+from petguard.users.models.petguard_user import insert_qrcode_to_account
+from petguard.pets.models import Pet, Alimentation, SpecialCares
+
+User = get_user_model()
+
+
+class BulkUpdatePetsTestCase(TestCase):
+    """
+    Teste para atualizar vários pets de uma vez no sistema
+    """
+
+    def setUp(self):
+        """
+        Método que roda a cada teste
+        """
+
+        post_save.disconnect(insert_qrcode_to_account, sender=PetGuardUser, dispatch_uid='insert_qrcode_to_account')
+
+        user1 = User.objects.create_user(
+            username='fulano1',
+            name='Fulano1',
+            email='fulano1@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user1 = PetGuardUser.objects.create(account=user1)
+
+        user2 = User.objects.create_user(
+            username='fulano2',
+            name='Fulano2',
+            email='fulano2@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user2 = PetGuardUser.objects.create(account=user2)
+
+        self.pets = []
+
+        for owner in [self.petguard_user1, self.petguard_user1, self.petguard_user2]:
+            self.pets.append(Pet.objects.create(
+                owner=owner,
+                name="XU",
+                kind="DOG",
+                sex="FEMALE",
+                height="SMALL",
+                temperament="FRIENDLY",
+                alimentation=Alimentation.objects.create(qtd="SMALL", food="pedigree", frequency=2),
+                special_cares=SpecialCares.objects.create(veterinary_frequency=2, bathing_frequency=1)
+            ))
+
+        self.query = """
+            mutation UpdatePets($data: [UpdatePetsInput!]!) {
+                petguard {
+                    pets {
+                        update_pets(data: $data) {
+                            pets {
+                                name
+                                alimentation {
+                                    food
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        self.request = GenericTestUtils.authenticate(self.petguard_user1.account)
+
+        self.maxDiff = None
+
+    def tearDown(self):
+        """
+        This method will run after any test.
+        """
+
+        SpecialCares.objects.all().delete()
+        Alimentation.objects.all().delete()
+        Pet.objects.all().delete()
+        PetGuardUser.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_update_pets(self):
+        """
+        Atualiza vários pets com um UPDATE por modelo alterada.
+        """
+
+        variables = {
+            'data': [
+                {'identify': self.pets[0].id, 'data': {'name': "BIDU"}},
+                {'identify': self.pets[1].id, 'data': {'name': "REX", 'alimentation': {'food': "whiskas"}}}
+            ]
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "update_pets": {
+                            "pets": [
+                                {'name': "BIDU", 'alimentation': {'food': "pedigree"}},
+                                {'name': "REX", 'alimentation': {'food': "whiskas"}}
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=variables,
+                context=self.request
+            )
+
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+
+        self.assertEqual(len(updates), 2)
+        self.assertFalse(any(SpecialCares._meta.db_table in sql for sql in updates))
+
+        self.pets[0].refresh_from_db()
+        self.pets[1].refresh_from_db()
+        self.assertEqual(self.pets[0].name, "BIDU")
+        self.assertEqual(self.pets[1].name, "REX")
+        self.assertEqual(self.pets[1].alimentation.food, "whiskas")
+
+    def test_update_pets_not_owner(self):
+        """
+        Nenhum pet é atualizado se algum deles não pertence ao usuário.
+        """
+
+        variables = {
+            'data': [
+                {'identify': self.pets[0].id, 'data': {'name': "BIDU"}},
+                {'identify': self.pets[2].id, 'data': {'name': "REX"}}
+            ]
+        }
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "Não foi encontrado o pet com o identificador passado.",
+                "cause": f"ID: {self.pets[2].id}"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.filter(name="XU").count(), 3)
+
+    def test_update_pets_invalid_item(self):
+        """
+        Nenhum pet é atualizado se algum item for inválido.
+        """
+
+        variables = {
+            'data': [
+                {'identify': self.pets[0].id, 'data': {'name': "BIDU"}},
+                {'identify': self.pets[1].id, 'data': {'name': ""}}
+            ]
+        }
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "Campo name não pode ser vazio.",
+                "cause": "Valor passado está vazio."
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.filter(name="XU").count(), 3)
+
+    def test_update_pets_duplicate_identify(self):
+        """
+        Nenhum pet é atualizado se o mesmo pet aparecer em mais de um item.
+        """
+
+        variables = {
+            'data': [
+                {'identify': self.pets[0].id, 'data': {'alimentation': {'food': "whiskas"}}},
+                {'identify': self.pets[0].id, 'data': {'name': "BIDU"}}
+            ]
+        }
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "O mesmo pet foi passado mais de uma vez.",
+                "cause": f"ID: {self.pets[0].id}"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=variables,
+            context=self.request
+        )
+
+        self.pets[0].refresh_from_db()
+        self.assertEqual(self.pets[0].name, "XU")
+        self.assertEqual(self.pets[0].alimentation.food, "pedigree")
@@ -1,11 +1,14 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.models.signals import post_save
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import skipUnless
 from common.test_utils import GenericTestUtils
 from petguard.users.models import PetGuardUser, PetGuardPartner
 from petguard.users.models.petguard_user import insert_qrcode_to_account
-from petguard.pets.models import Pet, Alimentation, SpecialCares
+from petguard.pets.models import Pet, Alimentation, SpecialCares, PetAdoptionFeed
 from vwapp.settings import BASE_DIR
 from datetime import datetime, timedelta
 import shutil
@@ -1235,3 +1238,250 @@ class CreatePetsTestCase(TestCase):
         self.assertEqual(Pet.objects.count(), 0)
         self.assertEqual(Alimentation.objects.count(), 0)
         self.assertEqual(SpecialCares.objects.count(), 0)
+
+    @override_settings(PETS_ADOPTION_FEED=True)
+    def test_create_pet_partner_adoption_feed(self):
+        """
+        Pet criado por uma ong entra no feed de adoção e o de um usuário não.
+        """
+
+        request = GenericTestUtils.authenticate(self.petguard_partner.account)
+
+        query = """
+            mutation CreatePets($data: CreatePetInput!) {
+                petguard {
+                    pets {
+                        create_pet(data: $data) {
+                            pet {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pet": {
+                            "pet": {
+                                'name': "XU"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=self.variables,
+            context=request
+        )
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 2)
+        self.assertEqual(PetAdoptionFeed.objects.count(), 1)
+        self.assertEqual(PetAdoptionFeed.objects.get().pet.ong, self.petguard_partner)
+
+    def test_create_pet_idempotency_key(self):
+        """
+        Repetir a requisição com a mesma chave retorna o pet já criado.
+        """
+
+        query = """
+            mutation CreatePets($data: CreatePetInput!, $key: String) {
+                petguard {
+                    pets {
+                        create_pet(data: $data, idempotency_key: $key) {
+                            pet {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pet": {
+                            "pet": {
+                                'name': "XU"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        self.variables['key'] = "5f0c6a52-retry"
+
+        for _ in range(2):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data=result,
+                variables=self.variables,
+                context=self.request
+            )
+
+        self.assertEqual(Pet.objects.count(), 1)
+        self.assertEqual(Alimentation.objects.count(), 1)
+        self.assertEqual(SpecialCares.objects.count(), 1)
+
+        self.variables['key'] = "5f0c6a52-other"
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 2)
+
+    def test_create_pet_idempotency_key_other_data(self):
+        """
+        Reusar a chave com outros dados é rejeitado, sem retornar nem criar outro pet.
+        """
+
+        query = """
+            mutation CreatePets($data: CreatePetInput!, $key: String) {
+                petguard {
+                    pets {
+                        create_pet(data: $data, idempotency_key: $key) {
+                            pet {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pet": {
+                            "pet": {
+                                'name': "XU"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        self.variables['key'] = "5f0c6a52-retry"
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.variables['data']['name'] = "XA"
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "A chave de idempotência já foi usada com outros dados.",
+                "cause": "Chave: 5f0c6a52-retry"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        self.assertEqual(list(Pet.objects.values_list('name', flat=True)), ["XU"])
+
+    @skipUnless(connection.vendor == 'postgresql', "INSERT em CTE somente no PostgreSQL.")
+    @override_settings(PETS_CREATE_SINGLE_STATEMENT=True)
+    def test_create_pet_single_statement(self):
+        """
+        Pet, alimentação e cuidados especiais criados em um único INSERT.
+        """
+
+        query = """
+            mutation CreatePets($data: CreatePetInput!) {
+                petguard {
+                    pets {
+                        create_pet(data: $data) {
+                            pet {
+                                name
+                                alimentation {
+                                    food
+                                }
+                                special_cares {
+                                    bathing_frequency
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pet": {
+                            "pet": {
+                                'name': "XU",
+                                'alimentation': {
+                                    'food': "pedigree"
+                                },
+                                'special_cares': {
+                                    'bathing_frequency': 1
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data=result,
+                variables=self.variables,
+                context=self.request
+            )
+
+        inserts = [item for item in context.captured_queries if 'INSERT' in item['sql']]
+
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Pet.objects.count(), 1)
+        self.assertEqual(Pet.objects.get().alimentation, Alimentation.objects.get())
+        self.assertEqual(Pet.objects.get().special_cares, SpecialCares.objects.get())
+        self.assertEqual(Pet.objects.get().owner, self.petguard_user)
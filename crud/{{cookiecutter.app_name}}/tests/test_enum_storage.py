@@ -0,0 +1,93 @@
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from petguard.users.models import PetGuardUser
+from petguard.users.models.petguard_user import insert_qrcode_to_account
+from petguard.pets.models import Pet
+from petguard.pets.fields import EnumField
+from petguard.pets.enum import PetTypeEnum
+from petguard.pets.search import SQLiteSearchBackend
+
+User = get_user_model()
+
+
+@skipUnless(isinstance(Pet._meta.get_field('kind'), EnumField), "Modelo gerada com enum_storage string.")
+class EnumStorageTestCase(TestCase):
+    """
+    Teste dos enums guardados como inteiros
+    """
+
+    def setUp(self):
+        """
+        Método que roda a cada teste
+        """
+
+        post_save.disconnect(insert_qrcode_to_account, sender=PetGuardUser, dispatch_uid='insert_qrcode_to_account')
+
+        user = User.objects.create_user(
+            username='fulano',
+            name='Fulano',
+            email='fulano@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user = PetGuardUser.objects.create(account=user)
+
+        self.pet = Pet.objects.create(
+            owner=self.petguard_user,
+            name="XU",
+            kind="CAT",
+            sex="FEMALE",
+            height="SMALL",
+            temperament="FRIENDLY"
+        )
+
+    def test_stored_as_code(self):
+        """
+        O banco guarda a posição do item no enum e a aplicação lê a string.
+        """
+
+        code = [tag.value for tag in PetTypeEnum].index("CAT") + 1
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT kind FROM {Pet._meta.db_table} WHERE id = %s", [self.pet.id])
+            stored = cursor.fetchone()[0]
+
+        self.assertEqual(stored, code)
+        self.assertEqual(Pet.objects.get(id=self.pet.id).kind, "CAT")
+        self.assertEqual(Pet.objects.filter(kind="CAT").count(), 1)
+        self.assertEqual(Pet.objects.filter(kind__in=["DOG", "CAT"]).count(), 1)
+
+    @skipUnless(connection.vendor == 'sqlite', "Triggers do FTS5 somente no SQLite.")
+    def test_search_triggers_after_alter(self):
+        """
+        A troca do tipo das colunas recria a tabela no SQLite, mas a busca FTS5 continua atualizada.
+        """
+
+        if not SQLiteSearchBackend.is_available():
+            self.skipTest("SQLite sem FTS5.")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                [Pet._meta.db_table]
+            )
+            triggers = {row[0] for row in cursor.fetchall()}
+
+        table = SQLiteSearchBackend.table
+
+        self.assertEqual(triggers, {f"{table}_insert", f"{table}_update", f"{table}_delete"})
+
+        pet = Pet.objects.create(
+            owner=self.petguard_user,
+            name="BISCOITO",
+            kind="DOG",
+            sex="MALE",
+            height="SMALL",
+            temperament="FRIENDLY"
+        )
+
+        found = SQLiteSearchBackend().search(Pet.objects.all(), "COIT")
+
+        self.assertEqual(list(found.values_list('id', flat=True)), [pet.id])
@@ -1,10 +1,15 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.db.models.signals import post_save
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from common.test_utils import GenericTestUtils
 from petguard.users.models import PetGuardUser, PetGuardPartner
 from petguard.users.models.petguard_user import insert_qrcode_to_account
 from petguard.pets.models import Pet, Alimentation, SpecialCares
+from petguard.pets.caching import PetResultCache
+from petguard.pets.identity import IdentityMap
 
 User = get_user_model()
 
@@ -429,3 +434,195 @@ class FetchPetTestCase(TestCase):
             variables=variables,
             context=request
         )
+
+    def test_fetch_same_pet_with_aliases(self):
+        """
+        Pedir o mesmo pet várias vezes na mesma consulta não repete as consultas no banco.
+        """
+
+        query = """
+            query FetchPet($identify: String!, $pet_id: String!) {
+                petguard {
+                    pets {
+                        first: instance(identify: $identify, pet_id: $pet_id) {
+                            name
+                        }
+                        second: instance(identify: $identify, pet_id: $pet_id) {
+                            name
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "instance": {
+                            "name": "XU",
+                        }
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as single:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        result['data']['petguard']['pets'] = {
+            "first": {"name": "XU"},
+            "second": {"name": "XU"}
+        }
+
+        with CaptureQueriesContext(connection) as aliases:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data=result,
+                variables=self.variables
+            )
+
+        self.assertEqual(len(aliases.captured_queries), len(single.captured_queries))
+
+    @override_settings(PETS_RESULT_CACHE='local')
+    def test_fetch_pet_cache(self):
+        """
+        O pet fica em cache até ser alterado.
+        """
+
+        cache.clear()
+        PetResultCache.clear()
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "instance": {
+                            "name": "XU",
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+        with self.assertNumQueries(0):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        self.pet1.name = "REX"
+        self.pet1.save()
+        PetResultCache.invalidate(self.pet1)
+
+        result['data']['petguard']['pets']['instance']['name'] = "REX"
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+        PetResultCache.clear()
+
+    @override_settings(PETS_RESULT_CACHE='local')
+    def test_fetch_pet_not_found_cache(self):
+        """
+        Pet não encontrado fica em cache por pouco tempo e retorna o mesmo erro.
+        """
+
+        cache.clear()
+        PetResultCache.clear()
+
+        self.variables['pet_id'] = self.pet2.id
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "Não foi encontrado o pet com o identificador passado.",
+                "cause": f"ID: {self.pet2.id}"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+        with self.assertNumQueries(0):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        PetResultCache.clear()
+
+    def test_fetch_pet_single_query(self):
+        """
+        O pet é buscado junto com a conta dona em uma única consulta.
+        """
+
+        variables = {
+            "identify": self.partner1.account.username,
+            "pet_id": self.pet3.id
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "instance": {
+                            "name": "PUFF",
+                        }
+                    }
+                }
+            }
+        }
+
+        with self.assertNumQueries(1):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=variables
+            )
+
+    def test_identity_map_fills_partial_pet(self):
+        """
+        A busca completa preenche o pet parcial da listagem em vez de recebê-lo pela metade.
+        """
+
+        identity_map = IdentityMap()
+        partial = identity_map.add(Pet.objects.only('id', 'name').get(id=self.pet1.id))
+        full = Pet.objects.select_related('alimentation').get(id=self.pet1.id)
+
+        with self.assertNumQueries(0):
+            pet = identity_map.add(full)
+
+            self.assertIs(pet, partial)
+            self.assertEqual(pet.get_deferred_fields(), set())
+            self.assertEqual(pet.kind, full.kind)
+            self.assertEqual(pet.alimentation.food, full.alimentation.food)
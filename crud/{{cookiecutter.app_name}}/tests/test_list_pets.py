@@ -1,11 +1,22 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.apps import apps
+from django.db import connection, migrations
+from django.test.utils import CaptureQueriesContext
 from django.db.models.signals import post_save
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from unittest import mock, skipIf, skipUnless
 from model_bakery import baker
 from common.test_utils import GenericTestUtils
 from petguard.users.models import PetGuardUser, PetGuardPartner
 from petguard.users.models.petguard_user import insert_qrcode_to_account
-from petguard.pets.models import Pet
+from petguard.pets.models import Pet, Alimentation, SpecialCares, PetAdoptionFeed
+from petguard.pets.pagination import KeysetPaginator
+from petguard.pets.feed import AdoptionFeed, fill_adoption_feed
+from petguard.pets.caching import PetResultCache
+from petguard.pets.search import PostgresSearchBackend
+from petguard.pets.lookups import IdentityLookup
+from petguard.pets.planner import QueryPlanner
 
 
 User = get_user_model()
@@ -653,3 +664,710 @@ class ListPetsTestCase(TestCase):
             data=result,
             variables=self.variables
         )
+
+    def test_list_pets_load_relations_in_batch(self):
+        """
+        As relações dos pets são carregadas com uma consulta por relação.
+        """
+
+        for pet in Pet.objects.filter(owner=self.user1):
+            pet.alimentation = baker.make(Alimentation, qtd="SMALL")
+            pet.special_cares = baker.make(SpecialCares, is_castrated=False)
+            pet.save()
+
+        query = """
+            query QueryPets($id: String!) {
+                petguard {
+                    pets {
+                        collection(identify: $id) {
+                            name
+                            alimentation {
+                                qtd
+                            }
+                            special_cares {
+                                is_castrated
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        relations = {
+            "alimentation": {"qtd": "SMALL"},
+            "special_cares": {"is_castrated": False}
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"name": "XU", **relations},
+                            {"name": "XU", **relations},
+                            {"name": "XU", **relations},
+                            {"name": "PUFF", **relations},
+                            {"name": "TOFF", **relations},
+                            {"name": "TOFF", **relations}
+                        ]
+                    }
+                }
+            }
+        }
+
+        # Sem o join do planner as relações ficam para os loaders.
+        with mock.patch.object(QueryPlanner, 'apply', lambda planner, queryset: queryset):
+            # Ids do dono e da ong do identificador + pets + uma consulta por relação.
+            with self.assertNumQueries(5):
+                GenericTestUtils.execute_graphql(
+                    test=self,
+                    query=query,
+                    data=result,
+                    variables={"id": self.user1.account.email}
+                )
+
+    def test_list_pets_load_relations_with_join(self):
+        """
+        As relações dos pets pedidas são carregadas junto com os pets.
+        """
+
+        for pet in Pet.objects.filter(owner=self.user1):
+            pet.alimentation = baker.make(Alimentation, qtd="SMALL")
+            pet.special_cares = baker.make(SpecialCares, is_castrated=False)
+            pet.save()
+
+        query = """
+            query QueryPets($id: String!) {
+                petguard {
+                    pets {
+                        collection(identify: $id) {
+                            name
+                            alimentation {
+                                qtd
+                            }
+                            special_cares {
+                                is_castrated
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        relations = {
+            "alimentation": {"qtd": "SMALL"},
+            "special_cares": {"is_castrated": False}
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"name": "XU", **relations},
+                            {"name": "XU", **relations},
+                            {"name": "XU", **relations},
+                            {"name": "PUFF", **relations},
+                            {"name": "TOFF", **relations},
+                            {"name": "TOFF", **relations}
+                        ]
+                    }
+                }
+            }
+        }
+
+        # Ids do dono e da ong do identificador + pets com as relações.
+        with self.assertNumQueries(3):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data=result,
+                variables={"id": self.user1.account.email}
+            )
+
+    def test_list_pets_load_only_requested_columns(self):
+        """
+        Somente as colunas pedidas na consulta são carregadas do banco.
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"kind": "DOG", "name": "XU"},
+                            {"kind": "DOG", "name": "XU"},
+                            {"kind": "DOG", "name": "XU"},
+                            {"kind": "DOG", "name": "PUFF"},
+                            {"kind": "CAT", "name": "TOFF"},
+                            {"kind": "CAT", "name": "TOFF"}
+                        ]
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        sql = context.captured_queries[-1]['sql']
+
+        self.assertEqual(len(context.captured_queries), 3)
+        self.assertIn('"kind"', sql)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"photo"', sql)
+
+    def test_list_pets_cursor_pagination(self):
+        """
+        Paginar os pets usando o cursor do último pet recebido.
+        """
+
+        query = """
+            query QueryPets($id: String!, $first: Int, $after: String) {
+                petguard {
+                    pets {
+                        collection(identify: $id, first: $first, after: $after) {
+                            name
+                            cursor
+                        }
+                    }
+                }
+            }
+        """
+
+        paginator = KeysetPaginator(Pet)
+        pets = list(paginator.order(Pet.objects.filter(owner=self.user1)))
+
+        variables = {
+            "id": self.user1.account.email,
+            "first": 2,
+            "after": paginator.encode(pets[1])
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"name": "XU", "cursor": paginator.encode(pets[2])},
+                            {"name": "PUFF", "cursor": paginator.encode(pets[3])}
+                        ]
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=variables
+        )
+
+    def test_list_pets_invalid_cursor(self):
+        """
+        Cursor de paginação inválido.
+        """
+
+        query = """
+            query QueryPets($id: String!, $after: String) {
+                petguard {
+                    pets {
+                        collection(identify: $id, after: $after) {
+                            name
+                        }
+                    }
+                }
+            }
+        """
+
+        variables = {
+            "id": self.user1.account.email,
+            "after": "invalid"
+        }
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "O cursor de paginação passado é inválido.",
+                "cause": "Valor passado: invalid"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=variables
+        )
+
+    def test_list_pets_connection(self):
+        """
+        Lista os pets no formato de conexão com o total de pets.
+        """
+
+        query = """
+            query QueryPets($id: String!, $first: Int, $after: String) {
+                petguard {
+                    pets {
+                        connection(identify: $id, first: $first, after: $after) {
+                            total_count
+                            page_info {
+                                has_next_page
+                                has_previous_page
+                                end_cursor
+                            }
+                            edges {
+                                node {
+                                    name
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        paginator = KeysetPaginator(Pet)
+        pets = list(paginator.order(Pet.objects.filter(owner=self.user1)))
+
+        variables = {
+            "id": self.user1.account.email,
+            "first": 2,
+            "after": paginator.encode(pets[1])
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "connection": {
+                            "total_count": 6,
+                            "page_info": {
+                                "has_next_page": True,
+                                "has_previous_page": True,
+                                "end_cursor": paginator.encode(pets[3])
+                            },
+                            "edges": [
+                                {"node": {"name": "XU"}},
+                                {"node": {"name": "PUFF"}}
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables=variables
+        )
+
+    @override_settings(PETS_COUNT_THRESHOLD=2)
+    def test_list_pets_connection_count_above_threshold(self):
+        """
+        Acima do limite configurado o total não é contado a cada requisição.
+        """
+
+        query = """
+            query QueryPets($id: String!) {
+                petguard {
+                    pets {
+                        connection(identify: $id) {
+                            total_count
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "connection": {
+                            "total_count": 6
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=query,
+            data=result,
+            variables={"id": self.user1.account.email}
+        )
+
+    @skipIf(connection.vendor == 'postgresql', "No PostgreSQL o total vem da estimativa do planejador.")
+    @override_settings(PETS_COUNT_THRESHOLD=2)
+    def test_list_pets_connection_count_invalidated(self):
+        """
+        O total guardado em cache muda assim que um pet do dono é criado ou removido.
+        """
+
+        query = """
+            query QueryPets($id: String!) {
+                petguard {
+                    pets {
+                        connection(identify: $id) {
+                            total_count
+                        }
+                    }
+                }
+            }
+        """
+
+        def assert_total(total):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data={
+                    "status": 200,
+                    "data": {
+                        "petguard": {
+                            "pets": {
+                                "connection": {
+                                    "total_count": total
+                                }
+                            }
+                        }
+                    }
+                },
+                variables={"id": self.user1.account.email}
+            )
+
+        assert_total(6)
+
+        pet = baker.make(Pet, owner=self.user1, kind="CAT", name="MIA")
+        PetResultCache.invalidate(pet)
+
+        assert_total(7)
+
+        pet.delete()
+        PetResultCache.invalidate(pet)
+
+        assert_total(6)
+
+    def test_list_pets_cached_identify(self):
+        """
+        O identificador do usuário é resolvido uma vez e filtrado pelo id do dono.
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"kind": "DOG", "name": "XU"},
+                            {"kind": "DOG", "name": "XU"},
+                            {"kind": "DOG", "name": "XU"},
+                            {"kind": "DOG", "name": "PUFF"},
+                            {"kind": "CAT", "name": "TOFF"},
+                            {"kind": "CAT", "name": "TOFF"}
+                        ]
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        sql = context.captured_queries[-1]['sql']
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('"owner_id" =', sql)
+        self.assertNotIn('"email"', sql)
+
+    def test_cached_identify_email_change(self):
+        """
+        Trocar o email da conta remove o email antigo do cache, mesmo que outra conta passe a usá-lo.
+        """
+
+        account = self.user1.account
+
+        self.assertEqual(IdentityLookup.resolve('fulano01@gmail.com')['owner'], self.user1.id)
+
+        account.email = 'novo01@gmail.com'
+        account.save()
+
+        self.assertEqual(IdentityLookup.resolve('fulano01@gmail.com'), {'owner': None, 'ong': None})
+        self.assertEqual(IdentityLookup.resolve('novo01@gmail.com')['owner'], self.user1.id)
+
+        self.user2.account.email = 'fulano01@gmail.com'
+        self.user2.account.save()
+
+        self.assertEqual(IdentityLookup.resolve('fulano01@gmail.com')['owner'], self.user2.id)
+
+    def test_cached_identify_username_change(self):
+        """
+        Trocar o username da conta remove o username antigo do cache.
+        """
+
+        account = self.user1.account
+
+        self.assertEqual(IdentityLookup.resolve('fulano01')['owner'], self.user1.id)
+
+        account.username = 'novo01'
+        account.save()
+
+        self.assertEqual(IdentityLookup.resolve('fulano01'), {'owner': None, 'ong': None})
+
+    def test_cached_identify_profile_create_and_delete(self):
+        """
+        Criar ou remover um perfil (dono ou ong) da conta atualiza o cache dos seus identificadores.
+        """
+
+        account = self.user1.account
+
+        self.assertEqual(IdentityLookup.resolve(account.email)['ong'], None)
+
+        partner = PetGuardPartner.objects.create(account=account)
+
+        self.assertEqual(IdentityLookup.resolve(account.email)['ong'], partner.id)
+
+        partner.delete()
+
+        self.assertEqual(IdentityLookup.resolve(account.email)['ong'], None)
+
+    def test_list_pets_search_ranked(self):
+        """
+        A pesquisa ordena os pets pela relevância do nome.
+        """
+
+        baker.make(Pet, owner=self.user1, kind="DOG", name="TOFFEE")
+
+        self.variables['search'] = "TOFF"
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"kind": "CAT", "name": "TOFF"},
+                            {"kind": "CAT", "name": "TOFF"},
+                            {"kind": "DOG", "name": "TOFFEE"}
+                        ]
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', "Índice pg_trgm somente no PostgreSQL.")
+    def test_search_uses_trigram_index(self):
+        """
+        A pesquisa por nome no PostgreSQL é atendida pelo índice GIN do pg_trgm.
+        """
+
+        backend = PostgresSearchBackend()
+        queryset = Pet.objects.filter(backend.get_name_condition("TOFF"))
+
+        # Com poucas linhas o planejador preferiria a leitura sequencial.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.assertIn(f"{Pet._meta.db_table}_{backend.field}_trgm", queryset.explain())
+        self.assertEqual(queryset.count(), 2)
+
+    @override_settings(PETS_ADOPTION_FEED=True)
+    def test_adoption_list_pets_from_feed_table(self):
+        """
+        Lista os pets em adoção a partir da tabela pré-calculada do feed.
+        """
+
+        AdoptionFeed.rebuild()
+
+        self.variables['is_adoption'] = True
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"kind": "DOG", "name": "TEF"},
+                            {"kind": "DOG", "name": "TEF"},
+                            {"kind": "DOG", "name": "TEF"},
+                            {"kind": "CAT", "name": "BUFF"},
+                            {"kind": "CAT", "name": "BUFF"},
+                            {"kind": "DOG", "name": "XAA"}
+                        ]
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        feed_table = PetAdoptionFeed._meta.db_table
+        feed_queries = [item['sql'] for item in context.captured_queries if f'FROM "{feed_table}"' in item['sql']]
+
+        # A página é lida somente da tabela do feed, sem join com os pets.
+        self.assertEqual(len(feed_queries), 1)
+        self.assertNotIn('JOIN', feed_queries[0])
+        self.assertFalse(any(f'JOIN "{feed_table}"' in item['sql'] for item in context.captured_queries))
+
+    def test_adoption_feed_filled_after_migrate(self):
+        """
+        O migrate que cria a tabela do feed preenche o feed com os pets que já estão em adoção.
+        """
+
+        label = PetAdoptionFeed._meta.app_label
+        migration = migrations.Migration('0002_adoption_feed', label)
+        migration.operations = [migrations.CreateModel(name='PetAdoptionFeed', fields=[])]
+
+        fill_adoption_feed(apps.get_app_config(label), plan=[(migration, True)])
+        self.assertFalse(PetAdoptionFeed.objects.exists())
+
+        fill_adoption_feed(apps.get_app_config(label), plan=[(migration, False)])
+        self.assertEqual(
+            set(PetAdoptionFeed.objects.values_list('pet_id', flat=True)),
+            set(Pet.objects.filter(AdoptionFeed.condition).values_list('id', flat=True))
+        )
+        self.assertEqual(PetAdoptionFeed.objects.count(), 6)
+
+    def test_list_pets_read_only_columns(self):
+        """
+        Listagem somente com colunas simples é montada a partir das colunas pedidas.
+        """
+
+        query = """
+            query QueryPets($id: String!) {
+                petguard {
+                    pets {
+                        collection(identify: $id) {
+                            name
+                            photo {
+                                name
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"name": "REX", "photo": {"name": ""}},
+                            {"name": "REX", "photo": {"name": ""}},
+                            {"name": "REX", "photo": {"name": ""}}
+                        ]
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=query,
+                data=result,
+                variables={"id": self.user2.account.email}
+            )
+
+        sql = context.captured_queries[-1]['sql']
+
+        self.assertIn('"photo"', sql)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('"kind"', sql)
+
+    @override_settings(PETS_RESULT_CACHE='local')
+    def test_list_pets_result_cache(self):
+        """
+        A listagem fica em cache até um pet do dono ser alterado.
+        """
+
+        cache.clear()
+        PetResultCache.clear()
+
+        self.variables['id'] = self.user2.account.email
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "collection": [
+                            {"kind": "DOG", "name": "REX"},
+                            {"kind": "DOG", "name": "REX"},
+                            {"kind": "DOG", "name": "REX"}
+                        ]
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+        with self.assertNumQueries(0):
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=self.variables
+            )
+
+        pet = baker.make(Pet, owner=self.user2, kind="CAT", name="MIA")
+        PetResultCache.invalidate(pet)
+
+        result['data']['petguard']['pets']['collection'].append({"kind": "CAT", "name": "MIA"})
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables
+        )
+
+        PetResultCache.clear()
@@ -0,0 +1,218 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from common.test_utils import GenericTestUtils
+from petguard.users.models import PetGuardUser
+from petguard.users.models.petguard_user import insert_qrcode_to_account
+from petguard.pets.models import Pet
+from petguard.pets.photos import PhotoPipeline
+from vwapp.settings import BASE_DIR
+import shutil
+
+User = get_user_model()
+
+
+@override_settings(PETS_PHOTO_PIPELINE=True, PETS_PHOTO_WORKERS=0, PETS_PHOTO_WIDTHS=(640, 320), PETS_PHOTO_FORMATS=('jpeg',))
+class PhotoPipelineTestCase(TestCase):
+    """
+    Teste do processamento assíncrono das fotos dos pets
+    """
+
+    def setUp(self):
+        """
+        Método que roda a cada teste
+        """
+
+        post_save.disconnect(insert_qrcode_to_account, sender=PetGuardUser, dispatch_uid='insert_qrcode_to_account')
+
+        user = User.objects.create_user(
+            username='fulano',
+            name='Fulano',
+            email='fulano@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user = PetGuardUser.objects.create(account=user)
+
+        self.query = """
+            mutation CreatePets($data: CreatePetInput!) {
+                petguard {
+                    pets {
+                        create_pet(data: $data) {
+                            pet {
+                                name
+                                photos {
+                                    width
+                                    format
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        avatar = GenericTestUtils.create_image(None, 'pet.png')
+
+        self.variables = {
+            'data': {
+                'name': "XU",
+                'kind': "DOG",
+                'sex': "FEMALE",
+                'height': "SMALL",
+                'temperament': "FRIENDLY",
+                'photo': SimpleUploadedFile("pet.png", avatar.getvalue())
+            }
+        }
+
+        self.request = GenericTestUtils.authenticate(self.petguard_user.account)
+
+    def tearDown(self):
+        """
+        This method will run after any test.
+        """
+
+        # Remove all image files created
+        shutil.rmtree(f"{BASE_DIR}/mediafiles/petguard_pets", ignore_errors=True)
+
+    def test_create_pet_staged_photo(self):
+        """
+        A foto fica em staging na criação e é trocada pelas versões processadas depois.
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "create_pet": {
+                            "pet": {
+                                'name': "XU",
+                                'photos': []
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=self.variables,
+            context=self.request
+        )
+
+        pet = Pet.objects.get()
+        staged = pet.photo.name
+
+        self.assertTrue(PhotoPipeline.is_staged(staged))
+        self.assertEqual(PhotoPipeline.process_pending(), 1)
+
+        pet.refresh_from_db()
+
+        self.assertFalse(PhotoPipeline.is_staged(pet.photo.name))
+        self.assertFalse(pet.photo.storage.exists(staged))
+        self.assertEqual(
+            [(width, fmt) for width, fmt, _ in PhotoPipeline.get_variants(pet.photo.name, pet.id)],
+            [(640, 'jpeg'), (320, 'jpeg')]
+        )
+
+        for _, _, name in PhotoPipeline.get_variants(pet.photo.name, pet.id):
+            self.assertTrue(pet.photo.storage.exists(name))
+
+    def test_replaced_photo_is_discarded(self):
+        """
+        Uma foto substituída antes de ser processada não sobrescreve a mais nova.
+        """
+
+        pet = Pet(
+            owner=self.petguard_user,
+            name="XU",
+            kind="DOG",
+            sex="FEMALE",
+            height="SMALL",
+            temperament="FRIENDLY",
+            photo=self.variables['data']['photo']
+        )
+        PhotoPipeline.stage(pet)
+        pet.save()
+        old = pet.photo.name
+
+        pet.photo = SimpleUploadedFile("new.png", GenericTestUtils.create_image(None, 'new.png').getvalue())
+        PhotoPipeline.stage(pet)
+        pet.save()
+
+        self.assertFalse(PhotoPipeline.process(pet.id, old))
+        self.assertTrue(PhotoPipeline.process(pet.id, pet.photo.name))
+
+    def test_variants_only_for_processed_names(self):
+        """
+        Só fotos geradas pelo processamento, na pasta do próprio pet, têm versões, mesmo após mudar o settings.
+        """
+
+        pet = Pet(
+            owner=self.petguard_user,
+            name="XU",
+            kind="DOG",
+            sex="FEMALE",
+            height="SMALL",
+            temperament="FRIENDLY",
+            photo=self.variables['data']['photo']
+        )
+        PhotoPipeline.stage(pet)
+        pet.save()
+
+        self.assertTrue(PhotoPipeline.process(pet.id, pet.photo.name))
+
+        pet.refresh_from_db()
+        variants = PhotoPipeline.get_variants(pet.photo.name, pet.id)
+
+        with self.settings(PETS_PHOTO_PIPELINE=False, PETS_PHOTO_WIDTHS=(1024,), PETS_PHOTO_FORMATS=('webp',)):
+            self.assertEqual(PhotoPipeline.get_variants(pet.photo.name, pet.id), variants)
+
+        self.assertEqual(PhotoPipeline.get_variants(pet.photo.name, pet.id + 1), [])
+        self.assertEqual(PhotoPipeline.get_variants("petguard_pets/pet_640.jpg", pet.id), [])
+        self.assertEqual(PhotoPipeline.get_variants(f"petguard_pets/{pet.id}/pet_640.jpg", pet.id), [])
+
+    def test_corrupt_photo_does_not_block_pending(self):
+        """
+        Uma foto inválida sai do staging, sem versões, e não impede o processamento das próximas.
+        """
+
+        pets = [
+            Pet(
+                owner=self.petguard_user,
+                name=name,
+                kind="DOG",
+                sex="FEMALE",
+                height="SMALL",
+                temperament="FRIENDLY",
+                photo=photo
+            )
+            for name, photo in (
+                ("XU", SimpleUploadedFile("bad.png", b"not an image")),
+                ("XA", self.variables['data']['photo'])
+            )
+        ]
+
+        for pet in pets:
+            PhotoPipeline.stage(pet)
+            pet.save()
+
+        staged = [pet.photo.name for pet in pets]
+
+        with self.assertLogs('petguard.pets.photos', level='ERROR'):
+            self.assertEqual(PhotoPipeline.process_pending(), 1)
+
+        for pet, name in zip(pets, staged):
+            pet.refresh_from_db()
+
+            self.assertFalse(PhotoPipeline.is_staged(pet.photo.name))
+            self.assertFalse(pet.photo.storage.exists(name))
+            self.assertTrue(pet.photo.storage.exists(pet.photo.name))
+
+        self.assertEqual(PhotoPipeline.get_variants(pets[0].photo.name, pets[0].id), [])
+        self.assertNotEqual(PhotoPipeline.get_variants(pets[1].photo.name, pets[1].id), [])
+        self.assertEqual(PhotoPipeline.process_pending(), 0)
@@ -0,0 +1,188 @@
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from common.test_utils import GenericTestUtils
+from petguard.users.models import PetGuardUser, PetGuardPartner
+from petguard.users.models.petguard_user import insert_qrcode_to_account
+from petguard.pets.models import Pet, Alimentation, SpecialCares
+from petguard.pets.purge import PetPurge
+from petguard.pets.caching import PetResultCache
+from datetime import timedelta
+
+User = get_user_model()
+
+
+@skipUnless(PetPurge.is_soft_delete(), "Modelo gerada sem a opção soft_delete.")
+class SoftDeletePetsTestCase(TestCase):
+    """
+    Teste do soft delete e do purge de pets
+    """
+
+    def setUp(self):
+        """
+        Método que roda a cada teste
+        """
+
+        post_save.disconnect(insert_qrcode_to_account, sender=PetGuardUser, dispatch_uid='insert_qrcode_to_account')
+
+        user = User.objects.create_user(
+            username='fulano',
+            name='Fulano',
+            email='fulano@gmail.com',
+            password='django1234'
+        )
+        self.petguard_user = PetGuardUser.objects.create(account=user)
+
+        self.pet = Pet.objects.create(
+            owner=self.petguard_user,
+            name="XU",
+            kind="DOG",
+            sex="FEMALE",
+            height="SMALL",
+            temperament="FRIENDLY",
+            alimentation=Alimentation.objects.create(qtd="SMALL", food="pedigree", frequency=2),
+            special_cares=SpecialCares.objects.create(veterinary_frequency=2, bathing_frequency=1)
+        )
+
+        self.query = """
+            mutation DeletePets($identify: Int!) {
+                petguard {
+                    pets {
+                        delete_pet(identify: $identify) {
+                            success
+                        }
+                    }
+                }
+            }
+        """
+
+        self.request = GenericTestUtils.authenticate(self.petguard_user.account)
+
+        self.maxDiff = None
+
+    def tearDown(self):
+        """
+        This method will run after any test.
+        """
+
+        Pet._base_manager.all().delete()
+        SpecialCares.objects.all().delete()
+        Alimentation.objects.all().delete()
+        PetGuardPartner.objects.all().delete()
+        PetGuardUser.objects.all().delete()
+        User.objects.all().delete()
+
+    def test_soft_delete_pet(self):
+        """
+        O pet removido some das consultas, mas a linha continua no banco até o purge.
+        """
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "delete_pet": {
+                            "success": True
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables={'identify': self.pet.id},
+            context=self.request
+        )
+
+        self.assertEqual(Pet.objects.count(), 0)
+        self.assertEqual(Pet._base_manager.count(), 1)
+        self.assertEqual(Alimentation.objects.count(), 1)
+        self.assertIsNotNone(Pet._base_manager.get().deleted_at)
+
+    def test_soft_delete_pet_twice(self):
+        """
+        Um pet já removido não é encontrado de novo.
+        """
+
+        PetPurge.soft_delete(Pet.objects.filter(id=self.pet.id))
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "Não foi encontrado o pet com o identificador passado.",
+                "cause": f"ID: {self.pet.id}"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables={'identify': self.pet.id},
+            context=self.request
+        )
+
+    @override_settings(PETS_RESULT_CACHE='local')
+    def test_soft_delete_invalidates_both_sides(self):
+        """
+        Remover um pet adotado de uma ong invalida o cache do dono e o da ong.
+        """
+
+        partner = User.objects.create_user(
+            username='ong',
+            name='Ong',
+            email='ong@gmail.com',
+            password='django1234'
+        )
+        self.pet.ong = PetGuardPartner.objects.create(account=partner)
+        self.pet.save()
+
+        scopes = [f"owner:{self.petguard_user.id}", f"ong:{self.pet.ong_id}", "adoption"]
+        versions = PetResultCache.get_versions(scopes)
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "delete_pet": {
+                            "success": True
+                        }
+                    }
+                }
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables={'identify': self.pet.id},
+            context=self.request
+        )
+
+        for old, new in zip(versions, PetResultCache.get_versions(scopes)):
+            self.assertNotEqual(new, old)
+
+    def test_purge(self):
+        """
+        O purge apaga somente os pets removidos há mais dias que a retenção.
+        """
+
+        PetPurge.soft_delete(Pet.objects.filter(id=self.pet.id))
+
+        self.assertEqual(PetPurge.purge(retention_days=1), 0)
+        self.assertEqual(Pet._base_manager.count(), 1)
+
+        Pet._base_manager.update(deleted_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(PetPurge.purge(retention_days=1), 1)
+        self.assertEqual(Pet._base_manager.count(), 0)
+        self.assertEqual(Alimentation.objects.count(), 0)
+        self.assertEqual(SpecialCares.objects.count(), 0)
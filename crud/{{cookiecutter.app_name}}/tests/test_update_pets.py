@@ -1,7 +1,9 @@
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from common.test_utils import GenericTestUtils
 from petguard.users.models import PetGuardUser, PetGuardPartner
 from petguard.users.models.petguard_user import insert_qrcode_to_account
@@ -1291,3 +1293,120 @@ class UpdatePetsTestCase(TestCase):
 
         self.pet1.refresh_from_db()
         self.assertEqual(0, self.pet1.special_cares.shear_frequency)
+
+    def test_update_only_changed_fields(self):
+        """
+        Somente as colunas alteradas são salvas e as relações sem mudanças não são escritas.
+        """
+
+        variables = {
+            'identify': self.pet1.id,
+            'data': {'name': "BIDU", 'alimentation': {'food': "pedigree"}}
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "update_pet": {
+                            "pet": {
+                                'name': "BIDU"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=variables,
+                context=self.request
+            )
+
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn(Pet._meta.db_table, updates[0])
+        self.assertIn('"name"', updates[0])
+        self.assertNotIn('"description"', updates[0])
+
+        self.pet1.refresh_from_db()
+        self.assertEqual(self.pet1.name, "BIDU")
+
+    def test_update_scalar_fields_returning(self):
+        """
+        Alterações somente de campos simples usam um único UPDATE ... RETURNING, sem SELECT do pet.
+        """
+
+        variables = {
+            'identify': self.pet1.id,
+            'data': {'name': "BIDU", 'weight': 3.5}
+        }
+
+        result = {
+            "status": 200,
+            "data": {
+                "petguard": {
+                    "pets": {
+                        "update_pet": {
+                            "pet": {
+                                'name': "BIDU"
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            GenericTestUtils.execute_graphql(
+                test=self,
+                query=self.query,
+                data=result,
+                variables=variables,
+                context=self.request
+            )
+
+        queries = [query['sql'] for query in context.captured_queries if Pet._meta.db_table in query['sql']]
+
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith('UPDATE'))
+        self.assertIn('RETURNING', queries[0])
+
+        self.pet1.refresh_from_db()
+        self.assertEqual(self.pet1.name, "BIDU")
+        self.assertEqual(self.pet1.weight, 3.5)
+
+    def test_update_scalar_fields_not_owner(self):
+        """
+        O UPDATE ... RETURNING não altera pets de outro usuário.
+        """
+
+        variables = {
+            'identify': self.pet2.id,
+            'data': {'name': "BIDU"}
+        }
+
+        result = {
+            "status": 400,
+            "error": {
+                "message": "Não foi encontrado o pet com o identificador passado.",
+                "cause": f"ID: {self.pet2.id}"
+            }
+        }
+
+        GenericTestUtils.execute_graphql(
+            test=self,
+            query=self.query,
+            data=result,
+            variables=variables,
+            context=self.request
+        )
+
+        self.pet2.refresh_from_db()
+        self.assertEqual(self.pet2.name, "XU")
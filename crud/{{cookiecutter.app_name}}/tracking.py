@@ -0,0 +1,144 @@
+class FieldTracker:
+    """
+    Guarda os valores carregados do banco para salvar somente as colunas alteradas.
+    """
+
+    @staticmethod
+    def snapshot(obj):
+        """
+        Guarda os valores atuais das colunas carregadas do objeto.
+        """
+
+        deferred = obj.get_deferred_fields()
+
+        obj._loaded_values = {
+            field.attname: obj.__dict__.get(field.attname)
+            for field in obj._meta.concrete_fields
+            if field.attname not in deferred
+        }
+
+    @staticmethod
+    def __is_changed(old, new):
+        """
+        Verifica se o valor da coluna mudou desde o snapshot.
+        """
+
+        # Arquivos novos ainda não foram enviados ao storage, mesmo com o mesmo nome.
+        if getattr(new, '_committed', True) is False:
+            return True
+
+        return old != new
+
+    @classmethod
+    def get_dirty_fields(cls, obj):
+        """
+        Nomes dos campos alterados desde o snapshot.
+
+        Retorna None quando o objeto não tem snapshot, ou seja, todas as
+        colunas devem ser salvas.
+        """
+
+        loaded = getattr(obj, '_loaded_values', None)
+
+        if loaded is None or obj._state.adding:
+            return None
+
+        return [
+            field.name
+            for field in obj._meta.concrete_fields
+            if field.attname in loaded and
+            cls.__is_changed(loaded[field.attname], getattr(obj, field.attname))
+        ]
+
+    @classmethod
+    def get_update_fields(cls, obj):
+        """
+        Campos que devem ir no UPDATE: os alterados mais as colunas com auto_now.
+
+        Sem snapshot todas as colunas são salvas.
+        """
+
+        dirty = cls.get_dirty_fields(obj)
+
+        if dirty is None:
+            return [field.name for field in obj._meta.concrete_fields if not field.primary_key]
+
+        if not dirty:
+            return []
+
+        # Colunas com auto_now só são atualizadas se estiverem no update_fields.
+        return dirty + [
+            field.name
+            for field in obj._meta.concrete_fields
+            if getattr(field, 'auto_now', False) and field.name not in dirty
+        ]
+
+    @classmethod
+    def save(cls, obj):
+        """
+        Salva somente as colunas alteradas e retorna se houve escrita no banco.
+        """
+
+        if cls.get_dirty_fields(obj) is None:
+            obj.save()
+        else:
+            fields = cls.get_update_fields(obj)
+
+            if not fields:
+                return False
+
+            obj.save(update_fields=fields)
+
+        cls.snapshot(obj)
+
+        return True
+
+    @classmethod
+    def bulk_save(cls, objs):
+        """
+        Salva objetos da mesma modelo com um bulk_update por conjunto de colunas alteradas.
+
+        Retorna os objetos que tiveram escrita no banco.
+        """
+
+        groups = {}
+
+        for obj in objs:
+            fields = cls.get_update_fields(obj)
+
+            if fields:
+                groups.setdefault(tuple(fields), []).append(obj)
+
+        for fields, group in groups.items():
+            meta = group[0]._meta
+
+            # O bulk_update não chama o pre_save, que envia os arquivos e preenche o auto_now.
+            for obj in group:
+                for name in fields:
+                    field = meta.get_field(name)
+                    setattr(obj, field.attname, field.pre_save(obj, False))
+
+            meta.model._default_manager.bulk_update(group, list(fields))
+
+            for obj in group:
+                cls.snapshot(obj)
+
+        return [obj for group in groups.values() for obj in group]
+
+
+class DirtyFieldsMixin:
+    """
+    Modelo que guarda o snapshot das colunas ao ser carregada do banco (ver FieldTracker).
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Cria o objeto a partir da linha do banco e guarda o snapshot.
+        """
+
+        obj = super().from_db(db, field_names, values)
+
+        FieldTracker.snapshot(obj)
+
+        return obj
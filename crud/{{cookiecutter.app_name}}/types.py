@@ -1,6 +1,9 @@
 from graphene_django import DjangoObjectType
 from common.generic_types import FileType
 from .models import Pet, Alimentation, SpecialCares
+from .loaders import PetLoaders
+from .pagination import KeysetPaginator
+from .photos import PhotoPipeline
 import graphene
 
 
@@ -29,6 +32,16 @@ class SpecialCaresType(DjangoObjectType):
         )
 
 
+class PetPhotoType(graphene.ObjectType):
+    """
+    Versão processada da foto do pet.
+    """
+
+    width = graphene.Int(description="Largura máxima da versão em pixels.")
+    format = graphene.String(description="Formato da imagem (jpeg, webp).")
+    url = graphene.String(description="Endereço da imagem.")
+
+
 class PetType(DjangoObjectType):
     """
     Objeto com todos os campos da modelo Pet.
@@ -48,6 +61,15 @@ class PetType(DjangoObjectType):
         description="Foto do pet."
     )
 
+    cursor = graphene.String(
+        description="Cursor do pet usado na paginação da listagem."
+    )
+
+    photos = graphene.List(
+        PetPhotoType,
+        description="Versões da foto em várias larguras e formatos (vazio enquanto a foto é processada)."
+    )
+
     @staticmethod
     def resolve_photo(parent, info):
         """
@@ -64,3 +86,65 @@ class PetType(DjangoObjectType):
             "size": 0,
             "width": 0
         }
+
+    @staticmethod
+    def resolve_photos(parent, info):
+        """
+        Pega as versões processadas da foto do pet.
+        """
+
+        storage = PhotoPipeline.get_storage()
+
+        return [
+            {"width": width, "format": fmt, "url": storage.url(name)}
+            for width, fmt, name in PhotoPipeline.get_variants(parent.photo.name, parent.id)
+        ]
+
+    @staticmethod
+    def resolve_cursor(parent, info):
+        """
+        Pega o cursor de paginação do pet.
+        """
+
+        return KeysetPaginator(Pet).encode(parent)
+    {%- for field in cookiecutter.model.fields if field.type in ["ForeignKey", "OneToOneField"] %}
+
+    @staticmethod
+    def resolve_{{field.name}}(parent, info):
+        """
+        Carrega o campo {{field.name}} em lote junto com os outros pets.
+        """
+
+        return PetLoaders.load(info, parent, '{{field.name}}')
+    {%- endfor %}
+
+
+class PetConnection(graphene.relay.Connection):
+    """
+    Conexão paginada de pets com a quantidade total de pets da listagem.
+    """
+
+    class Meta:
+        node = PetType
+
+    total_count = graphene.Int(
+        description="Quantidade total de pets (aproximada acima do limite configurado)."
+    )
+
+    @staticmethod
+    def resolve_total_count(parent, info):
+        """
+        Conta os pets somente quando o campo for pedido.
+        """
+
+        return parent.counter.count()
+
+
+class PetErrorType(graphene.ObjectType):
+    """
+    Erro de um item das mutações em lote.
+    """
+
+    index = graphene.Int(description="Posição do item na lista enviada.")
+    message = graphene.String(description="Mensagem do erro.")
+    cause = graphene.String(description="Causa do erro.")
@@ -0,0 +1,111 @@
+from common.exceptions import CustomError
+from .models import Pet
+
+
+class Validator:
+    """
+    Validação de um tipo de entrada montada uma única vez, na importação.
+
+    As regras vêm dos campos da modelo e viram uma tupla com os campos
+    obrigatórios e os validadores dos inputs aninhados, então cada validação
+    é só um laço. Os valores dos enums
+    já chegam validados pelos scalars (ver scalars.py). Os erros são os mesmos
+    do GenericValidations.
+    """
+
+    def __init__(self, required=(), nested=None):
+        """
+        Construtor
+        """
+
+        self.required = tuple(required)
+        self.nested = tuple((nested or {}).items())
+
+    @classmethod
+    def for_model(cls, model):
+        """
+        Monta o validador a partir dos campos da modelo.
+
+        São obrigatórios os campos editáveis sem blank, null ou default. As
+        relações um-para-um com campos obrigatórios viram validadores aninhados.
+        """
+
+        fields = [field for field in model._meta.concrete_fields if field.editable]
+
+        required = [
+            field.name for field in fields
+            if not field.is_relation and not field.blank and not field.null and not field.has_default()
+        ]
+
+        nested = {}
+
+        for field in fields:
+            if field.one_to_one:
+                validator = cls.for_model(field.related_model)
+
+                if validator.required or validator.nested:
+                    nested[field.name] = validator
+
+        return cls(required=required, nested=nested)
+
+    @staticmethod
+    def __get(values, name):
+        """
+        Pega o valor do campo de um dicionário (input do GraphQL) ou de um objeto (modelo).
+        """
+
+        if isinstance(values, dict):
+            return values.get(name)
+
+        return getattr(values, name, None)
+
+    def validate(self, values, partial=False):
+        """
+        Valida os valores, lançando o erro do primeiro campo inválido.
+
+        Com partial somente os campos presentes no dicionário são validados.
+        """
+
+        for name in self.required:
+            if partial and name not in values:
+                continue
+
+            if not self.__get(values, name):
+                raise CustomError(
+                    message=f"Campo {name} não pode ser vazio.",
+                    cause="Valor passado está vazio."
+                )
+
+        for name, validator in self.nested:
+            if partial and name not in values:
+                continue
+
+            children = self.__get(values, name)
+
+            if children:
+                validator.validate(children, partial)
+
+    def validate_many(self, items):
+        """
+        Valida uma lista de entradas em uma passada.
+
+        Retorna um dicionário com a posição e o erro de cada item inválido.
+        """
+
+        errors = {}
+
+        for index, values in enumerate(items):
+            try:
+                self.validate(values)
+            except CustomError as error:
+                errors[index] = error
+
+        return errors
+
+
+class PetValidators:
+    """
+    Validadores das entradas de pets.
+    """
+
+    pet = Validator.for_model(Pet)
@@ -17,10 +17,14 @@ cookiecutter(
             "string_attr": "name",
             "db_name": "petguard_pets",
             "ordering": "('created_at',)",
+            "account_fields": ["owner", "ong"],
+            "soft_delete": False,
+            "enum_storage": "string",
             "imports": [
                 {"path": "petguard.users.models", "value": ["PetGuardUser", "PetGuardPartner"]},
                 {"path": ".alimentation", "value": ["Alimentation"]},
-                {"path": ".special_cares", "value": ["SpecialCares"]}
+                {"path": ".special_cares", "value": ["SpecialCares"]},
+                {"path": "..enum", "value": ["PetTypeEnum", "PetSexEnum", "PetSizeEnum", "PetTemperamentEnum"]}
             ],
             "fields": [
                 {
@@ -55,6 +59,17 @@ cookiecutter(
                         "null": True
                     }
                 },
+                {
+                    "name": "special_cares",
+                    "type": "OneToOneField",
+                    "relationship": "SpecialCares",
+                    "description": "Cuidados especiais do pet.",
+                    "attr": {
+                        "on_delete": "models.CASCADE",
+                        "related_name": "'pet'",
+                        "null": True
+                    }
+                },
                 {
                     "name": "name",
                     "type": "CharField",
@@ -64,6 +79,50 @@ cookiecutter(
                         "max_length": 30
                     }
                 },
+                {
+                    "name": "kind",
+                    "type": "CharField",
+                    "title": "Tipo do pet",
+                    "description": "Tipo do animal de estimação.",
+                    "attr": {
+                        "max_length": 10,
+                        "choices": "[(tag.value, tag.value) for tag in PetTypeEnum]"
+                    },
+                    "enum": "PetTypeEnum"
+                },
+                {
+                    "name": "sex",
+                    "type": "CharField",
+                    "title": "Sexo do pet",
+                    "description": "Sexo do animal de estimação.",
+                    "attr": {
+                        "max_length": 10,
+                        "choices": "[(tag.value, tag.value) for tag in PetSexEnum]"
+                    },
+                    "enum": "PetSexEnum"
+                },
+                {
+                    "name": "height",
+                    "type": "CharField",
+                    "title": "Porte do pet",
+                    "description": "Porte do animal de estimação.",
+                    "attr": {
+                        "max_length": 10,
+                        "choices": "[(tag.value, tag.value) for tag in PetSizeEnum]"
+                    },
+                    "enum": "PetSizeEnum"
+                },
+                {
+                    "name": "temperament",
+                    "type": "CharField",
+                    "title": "Temperamento do pet",
+                    "description": "Temperamento do animal de estimação.",
+                    "attr": {
+                        "max_length": 10,
+                        "choices": "[(tag.value, tag.value) for tag in PetTemperamentEnum]"
+                    },
+                    "enum": "PetTemperamentEnum"
+                },
                 {
                     "name": "breed",
                     "type": "CharField",
@@ -74,6 +133,26 @@ cookiecutter(
                         "blank": True
                     }
                 },
+                {
+                    "name": "age",
+                    "type": "PositiveIntegerField",
+                    "title": "Idade do pet",
+                    "description": "Idade do animal de estimação.",
+                    "attr": {
+                        "blank": True,
+                        "null": True
+                    }
+                },
+                {
+                    "name": "phone",
+                    "type": "CharField",
+                    "title": "Telefone",
+                    "description": "Telefone para contato caso encontre o dono.",
+                    "attr": {
+                        "max_length": 15,
+                        "blank": True
+                    }
+                },
                 {
                     "name": "photo",
                     "type": "ImageField",
@@ -84,6 +163,44 @@ cookiecutter(
                         "blank": True,
                         "null": True
                     }
+                },
+                {
+                    "name": "weight",
+                    "type": "FloatField",
+                    "title": "Peso do pet",
+                    "description": "Peso do animal de estimação.",
+                    "attr": {
+                        "default": 0.0
+                    }
+                },
+                {
+                    "name": "description",
+                    "type": "TextField",
+                    "title": "Descrição",
+                    "description": "Breve descrição do comportamento do animal ou outras informações.",
+                    "attr": {
+                        "blank": True
+                    }
+                },
+                {
+                    "name": "is_adopted",
+                    "type": "BooleanField",
+                    "title": "Foi adotado?",
+                    "description": "Verifica se o pet da ONG já foi adotado.",
+                    "attr": {
+                        "default": False
+                    }
+                }
+            ],
+            "indexes": [
+                {"name": "pets_owner_created_idx", "fields": ["owner", "created_at", "id"]},
+                {"name": "pets_ong_created_idx", "fields": ["ong", "created_at", "id"]},
+                {"name": "pets_created_idx", "fields": ["created_at", "id"]},
+                {"name": "pets_kind_idx", "fields": ["kind", "is_adopted"], "include": ["name"]},
+                {
+                    "name": "pets_adoption_idx",
+                    "fields": ["created_at", "id"],
+                    "condition": "models.Q(owner__isnull=True, ong__isnull=False, is_adopted=False)"
                 }
             ]
         }